@@ -1,42 +1,149 @@
 import numpy as np
 from scipy.spatial.distance import pdist, squareform
 from convexpolygon import is_inside
-from pso_optimizer import generate_valid_points, ensure_inside
+from objectives import score
+from polytope import as_region, is_polytope, region_extent
+from pso_optimizer import generate_valid_points
+from repair import region_halfplanes, repair
+from checkpoint import run_fingerprint
+from history import FitnessHistory, RunResult, population_diversity, resume_history
+from warm_start import as_population
 import matplotlib.pyplot as plt
 
 from scipy.spatial.distance import pdist
 
-def evaluate(points):
-    distances = pdist(points)
-    return np.sum(distances ** 2)
+def evaluate(points, objective="sum_sq", weights=None):
+    return score(points, objective, weights)
 
 
 def compute_heuristic(candidate_points):
     n = len(candidate_points)
-    heuristic = np.zeros(n)
-    for i in range(n):
-        dist_sum = 0
-        for j in range(n):
-            if i != j:
-                dist_sum += np.linalg.norm(candidate_points[i] - candidate_points[j])
-        heuristic[i] = dist_sum / (n - 1)
+    heuristic = squareform(pdist(candidate_points)).sum(axis=1) / (n - 1)
     heuristic = heuristic / np.max(heuristic)  # normalize
     return heuristic
 
-def ant_colony_optimization(polygon, k, n_ants=50, n_iterations=100, alpha=1, beta=2,
-                            evaporation_rate=0.5, q=100):
-    from pso_optimizer import generate_valid_points, ensure_inside
-    from convexpolygon import is_inside
-
-    candidate_points = generate_valid_points(500, polygon)
-    pheromone = np.ones((k, len(candidate_points)))
-    heuristic = compute_heuristic(candidate_points)
+# --- Candidate sets: optima sit on the hull, so bias candidates towards it ---
+def sample_boundary(hull_vertices, n):
+    edges = np.roll(hull_vertices, -1, axis=0) - hull_vertices
+    lengths = np.linalg.norm(edges, axis=1)
+    cumulative = np.concatenate(([0.0], np.cumsum(lengths)))
+    s = (np.arange(n) + np.random.rand()) / n * cumulative[-1]
+    edge_idx = np.clip(np.searchsorted(cumulative, s, side='right') - 1, 0, len(edges) - 1)
+    t = (s - cumulative[edge_idx]) / lengths[edge_idx]
+    return hull_vertices[edge_idx] + t[:, None] * edges[edge_idx]
+
+def generate_candidates(polygon, n, strategy="uniform", boundary_share=0.5, halfplanes=None):
+    if strategy == "uniform":
+        return generate_valid_points(n, polygon)
+
+    # Boundary vertices in ring order; a non-convex polygon contributes all of its vertices
+    if halfplanes is None:
+        halfplanes = region_halfplanes(polygon)
+    ring = polygon.vertices if halfplanes is None else halfplanes[2]
+    hull_vertices = ring
+    if len(hull_vertices) > n:
+        # Detailed polygons and high-dimensional polytopes (2^d vertices for a cube) can
+        # have more vertices than candidates
+        hull_vertices = hull_vertices[np.random.choice(len(hull_vertices), n, replace=False)]
+    boundary = polygon.sample_boundary if is_polytope(polygon) else lambda m: sample_boundary(ring, m)
+    remaining = max(n - len(hull_vertices), 0)
+    if strategy == "boundary":
+        parts = [hull_vertices, boundary(remaining)]
+    elif strategy == "mixed":
+        n_boundary = int(round(boundary_share * remaining))
+        parts = [hull_vertices, boundary(n_boundary),
+                 generate_valid_points(remaining - n_boundary, polygon)]
+    else:
+        raise ValueError(f"Unknown candidate strategy '{strategy}'")
+    if halfplanes is None:
+        # Points exactly on a non-convex boundary are ambiguous to containment; nudge them in
+        parts[:2] = [polygon.project(p) if len(p) else p for p in parts[:2]]
+    return np.vstack([p for p in parts if len(p)])
+
+def refine_candidates(candidate_points, pheromone, polygon, halfplanes, n_parents, radius,
+                      repair_strategy="project"):
+    """Resample around the highest-pheromone candidates, replacing the weakest ones.
+
+    Children inherit their parent's pheromone so the colony's memory carries over
+    to the finer candidate set; children outside the polygon are repaired back in.
+    """
+    strength = pheromone.sum(axis=0)
+    order = np.argsort(strength)
+    parents = order[-n_parents:]
+    replaced = order[:len(order) - n_parents]
+    replaced = replaced[:len(replaced) // 2]
+    if len(replaced) == 0:
+        return candidate_points, pheromone
+
+    origin = parents[np.arange(len(replaced)) % n_parents]
+    children = candidate_points[origin] + np.random.uniform(-radius, radius, (len(replaced), candidate_points.shape[1]))
+    children = repair(children, polygon, repair_strategy, previous=candidate_points[origin], halfplanes=halfplanes)
+
+    candidate_points = np.copy(candidate_points)
+    pheromone = np.copy(pheromone)
+    candidate_points[replaced] = children
+    pheromone[:, replaced] = pheromone[:, origin]
+    return candidate_points, pheromone
 
-    best_fitness = -np.inf
-    best_solution = None
-    fitness_history = []
-
-    for iteration in range(n_iterations):
+def ant_colony_optimization(polygon, k, n_ants=50, n_iterations=100, alpha=1, beta=2,
+                            evaporation_rate=0.5, q=100, n_candidates=500, candidate_strategy="uniform",
+                            refine_every=None, refine_parents=20, refine_radius=0.1, refine_shrink=0.5,
+                            repair_strategy="project", callback=None, verbose=True, checkpoints=None,
+                            checkpointer=None, objective="sum_sq", weights=None, initial_points=None,
+                            history=None, halfplanes=None):
+    polygon = as_region(polygon)
+    if halfplanes is None:
+        halfplanes = region_halfplanes(polygon)
+    checkpoints = set(checkpoints or ())
+    restored = None
+    if checkpointer is not None:
+        restored = checkpointer.restore("ACO", run_fingerprint(
+            polygon, k, objective, weights, n_ants=n_ants, n_iterations=n_iterations, alpha=alpha, beta=beta,
+            evaporation_rate=evaporation_rate, q=q, n_candidates=n_candidates,
+            candidate_strategy=candidate_strategy, refine_every=refine_every, refine_parents=refine_parents,
+            refine_radius=refine_radius, refine_shrink=refine_shrink, repair_strategy=repair_strategy,
+            initial_points=initial_points))
+    if restored is not None:
+        candidate_points, pheromone = restored["candidate_points"], restored["pheromone"]
+        heuristic, radius = restored["heuristic"], restored["radius"]
+        best_solution, best_fitness = restored["best_solution"], restored["best_fitness"]
+        fitness_history = resume_history(history, restored["fitness_history"])
+        snapshots = restored["snapshots"]
+        start_iteration = restored["next_iteration"]
+    else:
+        candidate_points = generate_candidates(polygon, n_candidates, candidate_strategy, halfplanes=halfplanes)
+        best_fitness = -np.inf
+        best_solution = None
+        if initial_points is not None:
+            # Seed points join the candidate set and are reinforced like the paths of elite ants
+            seeds = as_population(initial_points, k, candidate_points.shape[1])
+            seed_indices = len(candidate_points) + np.arange(len(seeds) * k).reshape(len(seeds), k)
+            candidate_points = np.vstack([candidate_points] + list(seeds))
+            seed_fitness = [evaluate(seed, objective, weights) for seed in seeds]
+            best_idx = int(np.argmax(seed_fitness))
+            best_solution, best_fitness = seeds[best_idx], seed_fitness[best_idx]
+        pheromone = np.ones((k, len(candidate_points)))
+        if initial_points is not None:
+            for indices, score in sorted(zip(seed_indices, seed_fitness), key=lambda x: x[1], reverse=True)[:5]:
+                pheromone[np.arange(k), indices] += q * (score / (best_fitness + 1e-6))
+        heuristic = compute_heuristic(candidate_points)
+        radius = refine_radius * np.linalg.norm(region_extent(polygon))
+
+        fitness_history = history if history is not None else FitnessHistory()
+        fitness_history.reserve(n_iterations)
+        snapshots = {}  # iterations completed -> (best_solution, best_fitness)
+        start_iteration = 0
+
+    def checkpoint_state():
+        return {
+            "optimizer": "ACO", "next_iteration": iteration + 1,
+            "candidate_points": candidate_points, "pheromone": pheromone,
+            "heuristic": heuristic, "radius": radius,
+            "best_solution": best_solution, "best_fitness": best_fitness,
+            "fitness_history": fitness_history, "snapshots": snapshots,
+        }
+
+    for iteration in range(start_iteration, n_iterations):
         solutions = []
         fitness_scores = []
 
@@ -59,9 +166,9 @@ def ant_colony_optimization(polygon, k, n_ants=50, n_iterations=100, alpha=1, be
 
                 solution_indices.append(chosen_idx)
 
-            solution = np.array([candidate_points[idx] for idx in solution_indices])
-            solution = ensure_inside(solution, polygon)
-            fitness = evaluate(solution)
+            # Candidates lie inside (or on) the polygon by construction
+            solution = candidate_points[solution_indices]
+            fitness = evaluate(solution, objective, weights)
 
             if fitness > best_fitness:
                 best_fitness = fitness
@@ -80,15 +187,32 @@ def ant_colony_optimization(polygon, k, n_ants=50, n_iterations=100, alpha=1, be
             for i, idx in enumerate(indices):
                 pheromone[i][idx] += q * (score / (best_fitness + 1e-6))
 
-        fitness_history.append(best_fitness)
+        fitness_history.record(iteration, best_fitness, mean=lambda: np.mean(fitness_scores),
+                               diversity=lambda: population_diversity(candidate_points[solutions]))
+        if iteration + 1 in checkpoints:
+            snapshots[iteration + 1] = (np.copy(best_solution), best_fitness)
 
-        if (iteration + 1) % 10 == 0:
+        # callback(iteration, best_solution, best_fitness) may return True to stop early
+        if callback is not None and callback(iteration, best_solution, best_fitness):
+            break
+
+        # Multi-resolution refinement around high-pheromone regions
+        if refine_every and (iteration + 1) % refine_every == 0 and iteration < n_iterations - 1:
+            candidate_points, pheromone = refine_candidates(
+                candidate_points, pheromone, polygon, halfplanes, refine_parents, radius, repair_strategy)
+            heuristic = compute_heuristic(candidate_points)
+            radius *= refine_shrink
+
+        if verbose and (iteration + 1) % 10 == 0:
             print(f"Iteration {iteration+1}/{n_iterations} | Best Fitness: {best_fitness:.4f}")
 
         # Debug print every 50 iterations
-        if (iteration + 1) % 50 == 0:
+        if verbose and (iteration + 1) % 50 == 0:
             print("Pheromone max:", np.max(pheromone))
             print("Pheromone min:", np.min(pheromone))
             print("Sample fitness scores:", fitness_scores[:5])
 
-    return best_solution, best_fitness, fitness_history
+        if checkpointer is not None:
+            checkpointer.end_iteration(iteration, n_iterations, checkpoint_state)
+
+    return RunResult(best_solution, best_fitness, fitness_history, snapshots)
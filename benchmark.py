@@ -0,0 +1,234 @@
+import csv
+import random
+import time
+import warnings
+import numpy as np
+import matplotlib.pyplot as plt
+from portfolio import DEFAULT_SLICE_PARAMS, run_slice
+from sa_optimizer import simulated_annealing_batch
+from tuner import BUDGET_PARAM
+from warm_start import extend_placement
+
+# --- Multi-seed benchmarking ---
+# Every optimizer is run with N independent seeds per k, each for the largest iteration
+# budget. A per-iteration trace of (wall time, evaluations, best fitness) is recorded via
+# the optimizer callback, so every smaller budget and every point in time can be read off
+# the same runs. With warm_start, each seed's run for k + 1 starts from its k-point result
+# extended by one boundary point.
+#
+# "SA" is the adaptive simulated_annealing used everywhere else. "SA-batch" is the
+# vectorized geometric-cooling simulated_annealing_batch, a different algorithm, so it
+# is benchmarked and reported under its own name.
+
+BATCHED_SA = "SA-batch"
+
+OPTIMIZER_COLORS = {
+    "PSO": "#FF6F00",
+    "GA": "#4CAF50",
+    "ACO": "#2196F3",
+    "SA": "#9C27B0",
+    BATCHED_SA: "#E91E63",
+}
+
+
+def evaluations_per_iteration(optimizer, params):
+    if optimizer == "GA":
+        return params["pop_size"]
+    if optimizer == "PSO":
+        return params["num_particles"]
+    if optimizer == "ACO":
+        return params["n_ants"]
+    return 1
+
+
+def traced_run(optimizer, polygon, k, iterations, params, seed, initial_points=None):
+    """One seeded run; returns (best_points, best_fitness, trace) with trace rows (seconds, evaluations, best)."""
+    np.random.seed(seed)
+    random.seed(seed)
+    params = dict(params)
+    params[BUDGET_PARAM[optimizer]] = iterations
+    per_iteration = evaluations_per_iteration(optimizer, params)
+    trace = np.empty((iterations, 3))
+    rows = [0]
+    start = time.perf_counter()
+
+    def callback(iteration, best_points, best_fitness):
+        trace[iteration] = (time.perf_counter() - start, (iteration + 1) * per_iteration, best_fitness)
+        rows[0] = iteration + 1
+        return False
+
+    points, fitness = run_slice(optimizer, polygon, k, params, callback, initial_points)
+    return points, float(fitness), trace[:rows[0]]
+
+
+def batched_sa_runs(polygon, k, iterations, n_seeds, seed, initial_points=None):
+    """N seeds of simulated_annealing_batch in one call.
+
+    The seeds run in lockstep, so each trace's time column is the elapsed wall time of the
+    whole batch, not a per-seed share of it.
+    """
+    seeds = np.random.default_rng(seed).integers(2 ** 31 - 1, size=n_seeds)
+    trace = np.empty((iterations, n_seeds, 3))
+    rows = [0]
+    start = time.perf_counter()
+
+    def callback(iteration, best, best_fitness):
+        trace[iteration, :, 0] = time.perf_counter() - start
+        trace[iteration, :, 1] = iteration + 1
+        trace[iteration, :, 2] = best_fitness
+        rows[0] = iteration + 1
+        return False
+
+    points, fitness = simulated_annealing_batch([polygon] * n_seeds, k, iterations, callback=callback,
+                                                initial_points=initial_points, seeds=seeds)
+    return [(points[s], float(f), trace[:rows[0], s]) for s, f in enumerate(fitness)]
+
+
+def run_benchmark(polygon, k_values, budgets, optimizers=("GA", "PSO", "ACO", "SA"), n_seeds=10,
+                  params=None, seed=0, warm_start=False):
+    """Run n_seeds seeds per (k, optimizer) up to max(budgets) and return the run records.
+
+    `optimizers` may include BATCHED_SA ("SA-batch") next to the four optimizers.
+    """
+    rng = np.random.default_rng(seed)
+    params = {name: dict(DEFAULT_SLICE_PARAMS.get(name, {}), **(params or {}).get(name, {})) for name in optimizers}
+    max_budget = max(budgets)
+    records = []
+    previous = {}  # (optimizer, k) -> best placement of each seed
+    for k in sorted(k_values) if warm_start else k_values:
+        for optimizer in optimizers:
+            print(f"Benchmarking {optimizer} for k={k} with {n_seeds} seeds...")
+            seeds = [None] * n_seeds
+            if warm_start and (optimizer, k - 1) in previous:
+                objective = params[optimizer].get("objective", "sum_sq")
+                seeds = [extend_placement(points, polygon, objective) for points in previous[optimizer, k - 1]]
+            if optimizer == BATCHED_SA:
+                runs = batched_sa_runs(polygon, k, max_budget, n_seeds, int(rng.integers(2 ** 31 - 1)),
+                                       None if seeds[0] is None else np.array(seeds))
+            else:
+                runs = [traced_run(optimizer, polygon, k, max_budget, params[optimizer],
+                                   int(rng.integers(2 ** 31 - 1)), s) for s in seeds]
+            for run_id, (_, fitness, trace) in enumerate(runs):
+                records.append({"optimizer": optimizer, "k": k, "seed": run_id,
+                                "fitness": fitness, "trace": trace})
+            previous[optimizer, k] = [points for points, _, _ in runs]
+    return records
+
+
+def warm_start_sweep(optimizer, polygon, k_values, budgets, params=None, seed=None):
+    """Solve every (k, budget) cell with one optimizer, chaining warm starts.
+
+    Budgets run in increasing order, each continuing from the previous budget's best for
+    the extra iterations only; the first budget of k + 1 starts from the k-point result
+    extended by one boundary point. Returns rows of k, budget, points, fitness and the
+    wall time of the run that produced them.
+    """
+    if seed is not None:
+        np.random.seed(seed)
+        random.seed(seed)
+    params = dict(DEFAULT_SLICE_PARAMS[optimizer], **(params or {}))
+    objective = params.get("objective", "sum_sq")
+    rows = []
+    points = None
+    for k in sorted(k_values):
+        if points is not None:
+            while len(points) < k:
+                points = extend_placement(points, polygon, objective)
+        done = 0
+        for budget in sorted(budgets):
+            params[BUDGET_PARAM[optimizer]] = budget - done
+            start = time.perf_counter()
+            points, fitness = run_slice(optimizer, polygon, k, params, None, points)
+            rows.append({"k": k, "budget": budget, "points": points, "fitness": float(fitness),
+                         "seconds": time.perf_counter() - start})
+            done = budget
+    return rows
+
+
+def summarize(records, budgets, target=None, target_ratio=0.99):
+    """Median/IQR fitness, median wall time and success rate per (k, budget, optimizer).
+
+    A run succeeds when its best fitness at the budget reaches `target`; without an explicit
+    target, target_ratio times the best fitness seen for that k across all runs is used.
+    """
+    rows = []
+    for k in sorted({r["k"] for r in records}):
+        k_records = [r for r in records if r["k"] == k]
+        goal = target if target is not None else target_ratio * max(r["trace"][-1, 2] for r in k_records)
+        for budget in budgets:
+            for optimizer in dict.fromkeys(r["optimizer"] for r in k_records):
+                traces = [r["trace"] for r in k_records if r["optimizer"] == optimizer]
+                at_budget = np.array([t[min(budget, len(t)) - 1] for t in traces])
+                q25, median, q75 = np.percentile(at_budget[:, 2], [25, 50, 75])
+                rows.append({
+                    "k": k, "budget": budget, "optimizer": optimizer, "seeds": len(traces),
+                    "median_fitness": float(median), "iqr_low": float(q25), "iqr_high": float(q75),
+                    "median_seconds": float(np.median(at_budget[:, 0])),
+                    "median_evaluations": float(np.median(at_budget[:, 1])),
+                    "success_rate": float(np.mean(at_budget[:, 2] >= goal)),
+                    "target": float(goal),
+                })
+    return rows
+
+
+def anytime_profile(traces, time_grid):
+    """Median and IQR of best-so-far fitness at each time in time_grid across seeds."""
+    values = np.full((len(traces), len(time_grid)), np.nan)
+    for i, trace in enumerate(traces):
+        idx = np.searchsorted(trace[:, 0], time_grid, side='right') - 1
+        reached = idx >= 0
+        values[i, reached] = trace[idx[reached], 2]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # grid times before any run's first iteration
+        return np.nanpercentile(values, [25, 50, 75], axis=0)
+
+
+def plot_anytime_profiles(records, k, filename=None, points=200):
+    k_records = [r for r in records if r["k"] == k]
+    t_min = min(r["trace"][0, 0] for r in k_records)
+    t_max = max(r["trace"][-1, 0] for r in k_records)
+    time_grid = np.geomspace(max(t_min, 1e-6), t_max, points)
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for optimizer in dict.fromkeys(r["optimizer"] for r in k_records):
+        traces = [r["trace"] for r in k_records if r["optimizer"] == optimizer]
+        low, median, high = anytime_profile(traces, time_grid)
+        color = OPTIMIZER_COLORS.get(optimizer)
+        ax.plot(time_grid, median, label=optimizer, color=color, linewidth=2)
+        ax.fill_between(time_grid, low, high, color=color, alpha=0.2)
+    ax.set_xscale('log')
+    ax.set_title(f"Anytime Quality vs Time (k={k}, median and IQR over seeds)", fontsize=16, fontweight='bold')
+    ax.set_xlabel("Wall time (s)", fontsize=14)
+    ax.set_ylabel("Best fitness", fontsize=14)
+    ax.grid(True, linestyle='--', linewidth=0.7)
+    ax.legend()
+    plt.tight_layout()
+    if filename:
+        plt.savefig(filename, dpi=300)
+        plt.close(fig)
+    return fig
+
+
+def save_summary_csv(rows, filename):
+    with open(filename, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    from io_operations import get_polygon
+
+    k_values = [3, 4, 5]
+    budgets = [200, 500, 1000, 2000, 5000]
+    polygon = get_polygon()
+    n_seeds = int(input("Enter number of seeds per cell: "))
+    records = run_benchmark(polygon, k_values, budgets, n_seeds=n_seeds)
+    rows = summarize(records, budgets)
+    save_summary_csv(rows, "benchmark_summary.csv")
+    for k in k_values:
+        plot_anytime_profiles(records, k, f"anytime_profile_k{k}.png")
+    for row in rows:
+        print(f"k={row['k']} budget={row['budget']} {row['optimizer']}: median {row['median_fitness']:.4f} "
+              f"IQR [{row['iqr_low']:.4f}, {row['iqr_high']:.4f}] success {row['success_rate']:.0%} "
+              f"in {row['median_seconds']:.3f}s")
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import pickle
+import random
+import time
+import numpy as np
+
+# --- Checkpoint / resume for long optimizer runs ---
+# An optimizer hands its full loop state (as a dict of arrays and scalars) to a Checkpointer
+# at the end of an iteration. The global numpy and `random` RNG states are stored alongside,
+# so a resumed run continues bit-identically to one that was never interrupted. Each
+# checkpoint carries a fingerprint of the problem and settings it belongs to and is only
+# resumed by a run with the same fingerprint; a run that completes deletes its checkpoint.
+
+
+def run_fingerprint(polygon, k, objective, weights, **params):
+    """Digest of the region, k, objective, weights and parameters a run was started with."""
+    from polytope import is_region_object
+
+    digest = hashlib.sha1()
+    vertices = polygon.vertices if is_region_object(polygon) else polygon
+    parts = [("polygon", vertices), ("k", k), ("weights", weights)] + sorted(params.items())
+    if isinstance(objective, str):
+        parts.append(("objective", objective))
+    else:  # an objectives.Objective: identify it by its kernels
+        parts.append(("objective", [f"{fn.__module__}.{fn.__qualname__}" for fn in objective if fn is not None]))
+    for name, value in parts:
+        value = np.ascontiguousarray(value).tobytes() if isinstance(value, np.ndarray) else repr(value).encode()
+        digest.update(name.encode() + b"=" + value + b";")
+    return digest.hexdigest()
+
+
+def save_checkpoint(filename, state, fingerprint=None):
+    payload = {
+        "state": state,
+        "fingerprint": fingerprint,
+        "numpy_rng": np.random.get_state(),
+        "python_rng": random.getstate(),
+    }
+    # Write to a temporary file and swap it in, so a kill mid-write never corrupts the last checkpoint
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, 'wb') as file:
+        pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_filename, filename)
+
+
+def load_checkpoint(filename, fingerprint=None, optimizer=None):
+    """Restore the RNG states saved with the checkpoint and return the optimizer state.
+
+    Raises ValueError, leaving the RNG states alone, if `fingerprint` or `optimizer` is
+    given and differs from the saved one.
+    """
+    with open(filename, 'rb') as file:
+        payload = pickle.load(file)
+    saved = payload["state"].get("optimizer")
+    if optimizer is not None and saved != optimizer:
+        raise ValueError(f"{filename} holds a {saved} checkpoint, not {optimizer}")
+    if fingerprint is not None and payload.get("fingerprint") != fingerprint:
+        raise ValueError(f"{filename} belongs to a run with a different polygon, k, objective or "
+                         f"parameters; delete it or pass resume=False")
+    np.random.set_state(payload["numpy_rng"])
+    random.setstate(payload["python_rng"])
+    return payload["state"]
+
+
+class Checkpointer:
+    """Decides when to checkpoint an optimizer run and where to keep it.
+
+    Saves after every `every` iterations and/or once `seconds` have passed since the
+    previous save. With resume=True, restore() picks up an existing checkpoint file written
+    by a run with the same fingerprint. Optimizers call end_iteration() after every
+    iteration, which also removes the checkpoint once the last one has completed.
+    """
+
+    def __init__(self, filename, every=None, seconds=None, resume=True):
+        if every is None and seconds is None:
+            raise ValueError("Checkpointer needs `every` and/or `seconds`")
+        self.filename = filename
+        self.every = every
+        self.seconds = seconds
+        self.resume = resume
+        self.fingerprint = None
+        self.last_save = time.time()
+
+    def restore(self, optimizer, fingerprint=None):
+        self.fingerprint = fingerprint
+        if not self.resume or not os.path.exists(self.filename):
+            return None
+        state = load_checkpoint(self.filename, fingerprint, optimizer)
+        self.last_save = time.time()
+        return state
+
+    def maybe_save(self, iteration, state_fn):
+        """Save state_fn() if a checkpoint is due after `iteration` (0-based) has completed."""
+        due = self.every is not None and (iteration + 1) % self.every == 0
+        due = due or (self.seconds is not None and time.time() - self.last_save >= self.seconds)
+        if due:
+            save_checkpoint(self.filename, state_fn(), self.fingerprint)
+            self.last_save = time.time()
+        return due
+
+    def end_iteration(self, iteration, iterations, state_fn):
+        """Checkpoint after `iteration` (0-based) of `iterations` if due; after the last, finish()."""
+        if iteration + 1 >= iterations:
+            self.finish()
+            return False
+        return self.maybe_save(iteration, state_fn)
+
+    def finish(self):
+        """Delete the checkpoint of a run that has completed, so it is never resumed as a new one."""
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
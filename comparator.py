@@ -3,8 +3,10 @@ import numpy as np
 from pso_optimizer import particle_swarm_optimization
 from aco_optimizer import ant_colony_optimization
 from sa_optimizer import simulated_annealing
-from optimization import genetic_algorithm, fitness_function
+from optimization import genetic_algorithm
 from io_operations import get_polygon, get_test_points
+from history import FitnessHistory
+from warm_start import extend_placement
 
 # Define parameter grid
 k_values = [3, 4, 5]
@@ -12,16 +14,29 @@ iteration_values = [200, 500, 1000, 2000, 5000]
 
 # Fixed parameters for each algorithm
 NUM_PARTICLES = 200
+PSO_TOPOLOGY = "global"
+PSO_BOUNDARY = "absorb"     # keep boundary progress instead of resampling
+PSO_V_MAX = 0.2             # velocity clamp as a fraction of the polygon extent
 POP_SIZE = 200
 CROSSOVER_RATE = 0.8
 MUTATION_RATE = 0.001
+GA_REPAIR = "clamp"         # pull mutated points back along their move instead of resampling
 N_ANTS = 200
 ALPHA = 1.2
 BETA = 1.2
 EVAPORATION = 0.6
 Q = 100
-INIT_TEMP = 6000
-COOLING_RATE = 0.95
+ACO_CANDIDATES = 150
+ACO_STRATEGY = "mixed"      # hull vertices + boundary samples + interior points
+ACO_REFINE_EVERY = 10
+INIT_TEMP = "auto"          # calibrated from sampled fitness deltas
+COOLING_RATE = 0.95         # only used by the geometric schedule
+SA_SCHEDULE = "adaptive"
+SA_STEP_SIZE = None         # scale moves to the polygon extent
+SA_REHEAT_AFTER = 300
+SA_REPAIR = "clamp"
+WARM_START = True           # seed each k from the same optimizer's k-1 result plus one boundary point
+HISTORY_MODE = "improvement"  # best-so-far curves only change on improvements, so this loses nothing
 
 OPTIMIZER_COLORS = {
     "PSO": "#FF6F00",
@@ -30,41 +45,72 @@ OPTIMIZER_COLORS = {
     "SA": "#9C27B0"
 }
 
+
+def warm_seed(opt_name, k, best_points, polygon):
+    """Starting placement for `opt_name` at k: its (k-1)-point result plus one boundary point."""
+    previous = best_points.get(opt_name)
+    if not WARM_START or previous is None or len(previous) != k - 1:
+        return None
+    return extend_placement(previous, polygon)
+
+
 # Get polygon once
 polygon = get_polygon()
 if polygon is None or len(polygon) == 0:
     print("Invalid polygon input.")
     exit()
 
-# Run for each k and iteration
+# Run each optimizer once per k up to the largest budget and read the smaller
+# budgets off its checkpoints instead of rerunning from scratch
+max_iterations = max(iteration_values)
+best_points = {}  # optimizer -> best placement for the previous k
 for k in k_values:
+    print(f"\n========== Running for k={k}, Iterations={max_iterations} ==========")
+    runs = {}
+
+    # PSO
+    result = particle_swarm_optimization(
+        polygon, k, iterations=max_iterations, num_particles=NUM_PARTICLES, w=0.5, c1=1.5, c2=2.0,
+        topology=PSO_TOPOLOGY, v_max_fraction=PSO_V_MAX, boundary=PSO_BOUNDARY,
+        checkpoints=iteration_values, initial_points=warm_seed("PSO", k, best_points, polygon),
+        history=FitnessHistory(HISTORY_MODE))
+    best_points["PSO"] = result.points
+    runs["PSO"] = (result.history, result.snapshots)
+
+    # GA
+    test_points = get_test_points(k, polygon)
+    result = genetic_algorithm(
+        polygon, test_points, pop_size=POP_SIZE, generations=max_iterations,
+        crossover_rate=CROSSOVER_RATE, mutation_rate=MUTATION_RATE, checkpoints=iteration_values,
+        repair_strategy=GA_REPAIR, initial_points=warm_seed("GA", k, best_points, polygon),
+        history=FitnessHistory(HISTORY_MODE))
+    best_points["GA"] = result.points
+    runs["GA"] = (result.history, result.snapshots)
+
+    # ACO
+    result = ant_colony_optimization(
+        polygon, k, n_ants=N_ANTS, n_iterations=max_iterations, alpha=ALPHA,
+        beta=BETA, evaporation_rate=EVAPORATION, q=Q, n_candidates=ACO_CANDIDATES,
+        candidate_strategy=ACO_STRATEGY, refine_every=ACO_REFINE_EVERY, checkpoints=iteration_values,
+        initial_points=warm_seed("ACO", k, best_points, polygon), history=FitnessHistory(HISTORY_MODE))
+    best_points["ACO"] = result.points
+    runs["ACO"] = (result.history, result.snapshots)
+
+    # SA (its history also holds the initial fitness, hence the extra entry)
+    result = simulated_annealing(
+        polygon, k, initial_temp=INIT_TEMP, cooling_rate=COOLING_RATE, iterations=max_iterations,
+        schedule=SA_SCHEDULE, step_size=SA_STEP_SIZE, reheat_after=SA_REHEAT_AFTER,
+        repair_strategy=SA_REPAIR, checkpoints=iteration_values,
+        initial_points=warm_seed("SA", k, best_points, polygon), history=FitnessHistory(HISTORY_MODE))
+    best_points["SA"] = result.points
+    runs["SA"] = (result.history, result.snapshots)
+
     for iterations in iteration_values:
-        print(f"\n========== Running for k={k}, Iterations={iterations} ==========")
         results = {}
-
-        # PSO
-        pso_points, pso_fitness, pso_history = particle_swarm_optimization(
-            polygon, k, iterations=iterations, num_particles=NUM_PARTICLES, w=0.5, c1=1.5, c2=2.0)
-        results["PSO"] = {"fitness": pso_fitness, "history": pso_history}
-
-        # GA
-        test_points = get_test_points(k, polygon)
-        ga_points, _, ga_history = genetic_algorithm(
-            polygon, test_points, pop_size=POP_SIZE, generations=iterations,
-            crossover_rate=CROSSOVER_RATE, mutation_rate=MUTATION_RATE)
-        ga_fitness, _, _ = fitness_function(ga_points)
-        results["GA"] = {"fitness": ga_fitness, "history": ga_history}
-
-        # ACO
-        aco_points, aco_fitness, aco_history = ant_colony_optimization(
-            polygon, k, n_ants=N_ANTS, n_iterations=iterations, alpha=ALPHA,
-            beta=BETA, evaporation_rate=EVAPORATION, q=Q)
-        results["ACO"] = {"fitness": aco_fitness, "history": aco_history}
-
-        # SA
-        sa_points, sa_fitness, sa_history = simulated_annealing(
-            polygon, k, initial_temp=INIT_TEMP, cooling_rate=COOLING_RATE, iterations=iterations)
-        results["SA"] = {"fitness": sa_fitness, "history": sa_history}
+        for opt_name, (history, snapshots) in runs.items():
+            extra = 1 if opt_name == "SA" else 0
+            results[opt_name] = {"fitness": snapshots[iterations][1],
+                                 "history": history.up_to(iterations + extra)}
 
         # --- Plot: Bar chart ---
         plt.figure(figsize=(10, 5))
@@ -86,7 +132,8 @@ for k in k_values:
         for opt_name, data in results.items():
             history = data["history"]
             if history:
-                plt.plot(history, label=opt_name, color=OPTIMIZER_COLORS[opt_name], linewidth=2)
+                plt.plot(history.iterations, history.values, label=opt_name, color=OPTIMIZER_COLORS[opt_name],
+                         linewidth=2, drawstyle='steps-post')
         plt.title(f"Fitness Over Iterations (k={k}, iter={iterations})", fontsize=16, fontweight='bold')
         plt.xlabel("Iteration", fontsize=14)
         plt.ylabel("Fitness", fontsize=14)
@@ -1,4 +1,5 @@
 import numpy as np
+from polytope import is_region_object
 
 def is_convex(polygon):
     def cross_product(a, b, c):
@@ -56,6 +57,8 @@ def get_ellipse():
 
 def is_inside(point, polygon):
     """ Uses ray-casting algorithm to check if a point is inside the polygon """
+    if is_region_object(polygon):
+        return bool(polygon.contains(point))
     x, y = point
     n = len(polygon)
     intersections = 0
@@ -0,0 +1,214 @@
+import numpy as np
+
+# --- Compact fitness history ---
+# Optimizers record their best fitness into a FitnessHistory instead of appending to a list.
+# Values sit in preallocated arrays next to the iteration each belongs to, so sparse
+# recording still plots at the right x positions. Modes:
+#
+#   every       - every iteration
+#   log         - log-spaced iterations, dense early on where fitness moves fastest
+#   improvement - only when the value changes; exact for a best-so-far curve
+#
+# Once max_points values are stored, every other one is dropped and recording thins out
+# to match, so a run of any length stays within max_points. The latest value is always
+# kept, so the curve ends at the final fitness.
+#
+# Extras (e.g. "mean", "diversity") are optional per-iteration columns; optimizers pass
+# them as callables that are only evaluated for the points that are stored.
+
+HISTORY_MODES = ("every", "log", "improvement")
+
+
+def population_diversity(population):
+    """RMS distance of the (P, k, d) placements' points from the mean placement."""
+    population = np.asarray(population, dtype=float)
+    return float(np.sqrt(np.mean(np.sum((population - population.mean(axis=0)) ** 2, axis=-1))))
+
+
+class RunResult(tuple):
+    """What an optimizer returns: always unpacks as (points, fitness, history).
+
+    `snapshots` maps each requested checkpoint (iterations completed) to the
+    (best_points, best_fitness) at that point; it is empty unless checkpoints were requested.
+    The history is trimmed, so finished runs that are kept around hold no spare capacity.
+    """
+
+    def __new__(cls, points, fitness, history, snapshots=None):
+        result = super().__new__(cls, (points, fitness, history.trim()))
+        result.snapshots = snapshots if snapshots is not None else {}
+        return result
+
+    def __getnewargs__(self):
+        return tuple(self) + (self.snapshots,)
+
+    points = property(lambda self: self[0])
+    fitness = property(lambda self: self[1])
+    history = property(lambda self: self[2])
+
+
+def resume_history(history, restored):
+    """`history` holding the contents of a restored history, or `restored` itself if there is none."""
+    return restored if history is None else history.assign(restored)
+
+
+class FitnessHistory:
+    """Best-fitness trace of one run; indexes, slices and iterates like a list of values."""
+
+    def __init__(self, mode="every", dtype=np.float64, extras=(), max_points=1 << 16, capacity=256,
+                 log_growth=1.05):
+        if mode not in HISTORY_MODES:
+            raise ValueError(f"Unknown history mode '{mode}'. Choose from {list(HISTORY_MODES)}")
+        if max_points < 2:
+            raise ValueError("max_points must be at least 2")
+        self.mode = mode
+        self.dtype = np.dtype(dtype)
+        self.extras = tuple(extras)
+        self.max_points = max_points
+        self.log_growth = log_growth
+        self._allocate(max(1, min(capacity, max_points)))
+        self._size = 0
+        self._stride = 1        # minimum iteration spacing, doubled by each downsampling outside log mode
+        self._next_log = 1.0
+        self._last = None       # (iteration, value) of the latest record(), stored or not
+
+    def _allocate(self, capacity):
+        self._iterations = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty(capacity, dtype=self.dtype)
+        self._columns = {name: np.empty(capacity, dtype=self.dtype) for name in self.extras}
+
+    def _resize(self, capacity):
+        iterations, values, columns = self._iterations, self._values, self._columns
+        self._allocate(capacity)
+        n = self._size
+        self._iterations[:n] = iterations[:n]
+        self._values[:n] = values[:n]
+        for name in self.extras:
+            self._columns[name][:n] = columns[name][:n]
+
+    def assign(self, other):
+        """Take over the contents and settings of `other`, e.g. a history restored from a checkpoint."""
+        self.__dict__.update(other.__dict__)
+        return self
+
+    def reserve(self, iterations):
+        """Preallocate for a run of `iterations` in "every" mode."""
+        if self.mode == "every":
+            needed = min(self._size + iterations // self._stride + 2, self.max_points)
+            if needed > len(self._values):
+                self._resize(needed)
+
+    def trim(self):
+        """Release unused capacity; RunResult does this for every finished run."""
+        if len(self._values) > self._size:
+            self._resize(max(self._size, 1))
+        return self
+
+    def _downsample(self):
+        keep = slice(0, self._size, 2)
+        n = len(range(self._size)[keep])
+        self._iterations[:n] = self._iterations[keep]
+        self._values[:n] = self._values[keep]
+        for column in self._columns.values():
+            column[:n] = column[keep]
+        self._size = n
+        # Dropping every other point of a log-spaced run squares its spacing ratio; the
+        # other modes keep their spacing by doubling the minimum stride
+        if self.mode == "log":
+            self.log_growth *= self.log_growth
+        else:
+            self._stride *= 2
+
+    def _due(self, iteration, value):
+        if self._size == 0:
+            return True
+        if iteration - self._iterations[self._size - 1] < self._stride:
+            return False
+        if self.mode == "every":
+            return iteration % self._stride == 0
+        if self.mode == "improvement":
+            return value != self._values[self._size - 1]
+        return iteration + 1 >= self._next_log
+
+    def record(self, iteration, value, **extras):
+        """Record `value` for `iteration`; extras may be plain values or callables."""
+        self._last = (iteration, value)
+        if not self._due(iteration, value):
+            return
+        if self._size == len(self._values):
+            if self._size < self.max_points:
+                self._resize(min(2 * self._size, self.max_points))
+            else:
+                self._downsample()
+                if not self._due(iteration, value):
+                    return
+        i = self._size
+        self._iterations[i] = iteration
+        self._values[i] = value
+        for name in self.extras:
+            extra = extras.get(name, np.nan)
+            self._columns[name][i] = extra() if callable(extra) else extra
+        self._size += 1
+        if self.mode == "log":
+            self._next_log = max(self._next_log + 1, (iteration + 1) * self.log_growth)
+
+    def append(self, value):
+        self.record(self._last[0] + 1 if self._last is not None else 0, value)
+
+    def _has_tail(self):
+        """Whether the latest recorded value is missing from the stored points."""
+        return self._last is not None and (self._size == 0 or self._last[0] > self._iterations[self._size - 1])
+
+    @property
+    def iterations(self):
+        iterations = self._iterations[:self._size]
+        return np.append(iterations, self._last[0]) if self._has_tail() else iterations
+
+    @property
+    def values(self):
+        values = self._values[:self._size]
+        return np.append(values, self.dtype.type(self._last[1])) if self._has_tail() else values
+
+    def extra(self, name):
+        column = self._columns[name][:self._size]
+        return np.append(column, np.nan) if self._has_tail() else column
+
+    def at(self, iteration):
+        """Value of the latest point recorded at or before `iteration`."""
+        iterations = self.iterations
+        idx = np.searchsorted(iterations, iteration, side='right') - 1
+        if idx < 0:
+            raise IndexError(f"No value recorded at or before iteration {iteration}")
+        return self.values[idx]
+
+    def up_to(self, iteration):
+        """Compact copy of the history before `iteration`, ending at the value it had then."""
+        iterations, values = self.iterations, self.values
+        n = int(np.searchsorted(iterations, iteration))
+        copy = FitnessHistory(self.mode, self.dtype, self.extras, self.max_points, capacity=n,
+                              log_growth=self.log_growth)
+        copy._iterations[:n] = iterations[:n]
+        copy._values[:n] = values[:n]
+        for name in self.extras:
+            copy._columns[name][:n] = self.extra(name)[:n]
+        copy._size = n
+        copy._stride = self._stride
+        if n and self._last is not None:
+            end = min(iteration - 1, self._last[0])
+            copy._last = (end, values[n - 1])
+        return copy
+
+    def __len__(self):
+        return self._size + int(self._has_tail())
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.values
+        return values if dtype is None else values.astype(dtype)
+
+    def __repr__(self):
+        return f"FitnessHistory(mode={self.mode!r}, points={len(self)}, last={self._last})"
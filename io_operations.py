@@ -1,6 +1,7 @@
 import numpy as np
 from convexpolygon import is_convex, get_rectangle, get_circle, get_ellipse, is_inside
 import csv
+import os
 
 def get_vertices_from_console(n):
     vertices = []
@@ -27,6 +28,118 @@ def get_vertices_from_csv():
         print(f"Error reading file: {e}")
         return None
 
+# --- Bulk multi-instance ingestion ---
+# CSV layout: instance_id, x, y[, role] with role 0 = polygon vertex, 1 = test point.
+# Binary layout: a .npz archive (or a "<stem>.vertices.npy" family of .npy files)
+# holding a flat `vertices` array with `offsets` marking where each instance starts,
+# plus optional `points`/`point_offsets` and `ids`.
+def _split_by_offsets(flat, offsets):
+    return [flat[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+def _offsets_from_sorted_ids(sorted_ids, unique_ids):
+    starts = np.searchsorted(sorted_ids, unique_ids, side='left')
+    return np.append(starts, len(sorted_ids))
+
+def _load_instance_csv(filename, delimiter=','):
+    with open(filename, 'r') as file:
+        first = file.readline().split(delimiter)
+    try:
+        float(first[0])
+        skip = 0
+    except ValueError:
+        skip = 1  # header row
+    data = np.loadtxt(filename, delimiter=delimiter, skiprows=skip, ndmin=2)
+    if data.shape[1] < 3:
+        raise ValueError("Instance CSV needs at least instance_id, x, y columns")
+
+    order = np.argsort(data[:, 0], kind='stable')
+    data = data[order]
+    roles = data[:, 3].astype(np.int8) if data.shape[1] > 3 else np.zeros(len(data), dtype=np.int8)
+    ids = np.unique(data[:, 0])
+    if np.all(ids == np.round(ids)):
+        ids = ids.astype(np.int64)
+
+    is_vertex = roles == 0
+    vertex_ids = data[is_vertex, 0]
+    vertices = np.ascontiguousarray(data[is_vertex, 1:3])
+    point_ids = data[~is_vertex, 0]
+    points = np.ascontiguousarray(data[~is_vertex, 1:3])
+
+    arrays = {
+        'ids': ids,
+        'vertices': vertices,
+        'offsets': _offsets_from_sorted_ids(vertex_ids, ids),
+    }
+    if len(points):
+        arrays['points'] = points
+        arrays['point_offsets'] = _offsets_from_sorted_ids(point_ids, ids)
+    return arrays
+
+def _npy_family(path):
+    stem = path[:-len('.vertices.npy')]
+    return {name: f"{stem}.{name}.npy" for name in ('vertices', 'offsets', 'points', 'point_offsets', 'ids')}
+
+def _load_instance_arrays(path, mmap=True):
+    mmap_mode = 'r' if mmap else None
+    if path.endswith('.vertices.npy'):
+        arrays = {}
+        for name, member in _npy_family(path).items():
+            if os.path.exists(member):
+                arrays[name] = np.load(member, mmap_mode=mmap_mode)
+        return arrays
+    if path.endswith('.npz'):
+        # npz members cannot be memory-mapped; each array is read once and then sliced as views
+        with np.load(path) as archive:
+            return {name: archive[name] for name in archive.files}
+    if path.endswith('.csv'):
+        return _load_instance_csv(path)
+    raise ValueError(f"Unsupported instance file: {path}")
+
+def load_instances(path, mmap=True):
+    """Yield (instance_id, polygon, test_points) for every instance stored in `path`.
+
+    Polygons and test points are views into one flat array, so large files are
+    never parsed row by row; test_points is None when the file carries none.
+    """
+    arrays = _load_instance_arrays(path, mmap=mmap)
+    if 'vertices' not in arrays or 'offsets' not in arrays:
+        raise ValueError(f"{path} must provide 'vertices' and 'offsets' arrays")
+
+    polygons = _split_by_offsets(arrays['vertices'], arrays['offsets'])
+    if 'points' in arrays:
+        test_points = _split_by_offsets(arrays['points'], arrays['point_offsets'])
+    else:
+        test_points = [None] * len(polygons)
+    ids = arrays['ids'] if 'ids' in arrays else np.arange(len(polygons))
+
+    for instance_id, polygon, points in zip(ids, polygons, test_points):
+        if len(polygon) == 0:
+            raise ValueError(f"Instance {instance_id.item()} in {path} has no polygon vertices")
+        if points is not None and len(points) == 0:
+            points = None
+        yield instance_id.item(), polygon, points
+
+def save_instances(path, polygons, test_points=None, ids=None):
+    """Write polygons (and optional per-instance test points) in the flat offsets layout."""
+    arrays = {
+        'vertices': np.concatenate([np.asarray(p, dtype=float) for p in polygons]),
+        'offsets': np.cumsum([0] + [len(p) for p in polygons]),
+        'ids': np.arange(len(polygons)) if ids is None else np.asarray(ids),
+    }
+    if test_points is not None:
+        point_arrays = [np.empty((0, 2)) if p is None else np.asarray(p, dtype=float) for p in test_points]
+        arrays['points'] = np.concatenate(point_arrays)
+        arrays['point_offsets'] = np.cumsum([0] + [len(p) for p in point_arrays])
+
+    if path.endswith('.vertices.npy'):
+        for name, member in _npy_family(path).items():
+            if name in arrays:
+                np.save(member, arrays[name])
+    elif path.endswith('.npz'):
+        np.savez(path, **arrays)
+    else:
+        raise ValueError(f"Unsupported instance file: {path}")
+
 def generate_regular_polygon(n, radius=1.0, center=(0, 0)):
     angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
     return np.array([
@@ -36,7 +149,7 @@ def generate_regular_polygon(n, radius=1.0, center=(0, 0)):
 
 def get_polygon():
     while True:
-        choice = int(input("Enter polygon type:\n1. Triangle\n2. Rectangle\n3. Circle\n4. Ellipse\n5. Any other Convex Polygon\nEnter choice (1-5): "))
+        choice = int(input("Enter polygon type:\n1. Triangle\n2. Rectangle\n3. Circle\n4. Ellipse\n5. Any other Polygon (convex or not)\nEnter choice (1-5): "))
 
         if choice == 1:
             return get_vertices_from_console(3)
@@ -65,10 +178,9 @@ def get_polygon():
                         print("Invalid choice. Try again.")
                         continue
 
-                    if is_convex(polygon):
-                        return polygon
-                    else:
-                        print("The polygon is not convex. Please enter a convex polygon.")
+                    if not is_convex(polygon):
+                        print("The polygon is not convex; it will be solved through a grid spatial index.")
+                    return polygon
             elif sub_choice == 2:
                 n = int(input("Enter number of vertices for the regular polygon (>=3): "))
                 if n < 3:
@@ -11,6 +11,7 @@ from pso_optimizer import particle_swarm_optimization
 from aco_optimizer import ant_colony_optimization
 from sa_optimizer import simulated_annealing
 from plotting import plot_polygon
+from history import FitnessHistory
 
 
 def log_to_csv(filename, headers, data):
@@ -30,19 +31,21 @@ OPTIMIZER_COLORS = {
 
 
 def plot_fitness_history(history, title, ax, color):
-    if history and len(history) > 0:
-        x_vals = range(len(history))
-        ax.plot(x_vals, history, marker='o', color=color, linestyle='-', label='Fitness')
+    if history is not None and len(history) > 0:
+        # A FitnessHistory may be sparse; plot it against the iterations it was recorded at
+        x_vals = history.iterations if isinstance(history, FitnessHistory) else np.arange(len(history))
+        y_vals = np.asarray(history)
+        ax.plot(x_vals, y_vals, color=color, linestyle='-', linewidth=2, drawstyle='steps-post', label='Fitness')
         ax.set_title(title, fontsize=16, fontweight='bold')
         ax.set_xlabel("Iteration", fontsize=14)
         ax.set_ylabel("Fitness", fontsize=14)
         ax.grid(True, linestyle=':', color='gray', linewidth=0.7)
         ax.legend()
 
-        indices_to_annotate = [0, len(history) // 2, len(history) - 1]
+        indices_to_annotate = [0, len(y_vals) // 2, len(y_vals) - 1]
         for idx in indices_to_annotate:
-            ax.annotate(f"{history[idx]:.2f}",
-                        (x_vals[idx], history[idx]),
+            ax.annotate(f"{y_vals[idx]:.2f}",
+                        (x_vals[idx], y_vals[idx]),
                         textcoords="offset points",
                         xytext=(0, 10),
                         ha='center',
@@ -218,11 +221,13 @@ def main():
                     print("--- Iteration Count Analysis ---")
                     for p_count in fixed_particles_list:
                         print(f"\nTesting for {p_count} particles...")
+                        # One run up to the largest count, read off at every checkpoint
+                        snapshots = particle_swarm_optimization(
+                            polygon, k, num_particles=p_count, iterations=max(iteration_list), w=w, c1=c1, c2=c2,
+                            checkpoints=iteration_list
+                        ).snapshots
                         for iters in iteration_list:
-                            print(f"  → Running with {iters} iterations")
-                            best_points, best_fitness, _ = particle_swarm_optimization(
-                                polygon, k, num_particles=p_count, iterations=iters, w=w, c1=c1, c2=c2
-                            )
+                            best_fitness = snapshots[iters][1]
                             fitness_result_map[p_count].append(best_fitness)
                             csv_data.append([p_count, iters, best_fitness])
 
@@ -0,0 +1,93 @@
+from collections import namedtuple
+import numpy as np
+
+# --- Placement objectives ---
+# Every objective scores a placement of k points (higher is better) and provides
+#   batch(points, weights)                   score of each (..., k, d) placement
+#   delta(points, index, new_point, weights) change in score when points[index] moves to
+#                                            new_point, in O(k); None when there is no
+#                                            such shortcut and callers must re-score
+# Only "weighted" uses `weights` (one per point); the others ignore it.
+
+Objective = namedtuple("Objective", ["batch", "delta"])
+
+
+def _pairwise_distances(points):
+    diff = points[..., :, None, :] - points[..., None, :, :]
+    return np.sqrt(np.sum(diff ** 2, axis=-1))
+
+
+# sum_{i<j} |x_i - x_j|^2 = k * sum_i |x_i - c|^2 with c the centroid. Centring first avoids
+# the cancellation that k * sum |x|^2 - |sum x|^2 suffers far from the origin.
+def sum_sq(points, weights=None):
+    points = np.asarray(points, dtype=float)
+    centred = points - np.mean(points, axis=-2, keepdims=True)
+    return points.shape[-2] * np.sum(centred ** 2, axis=(-2, -1))
+
+def sum_sq_delta(points, index, new_point, weights=None):
+    # With m = new - old: sum_{j != i} |new - x_j|^2 - |old - x_j|^2 = (k-1)|m|^2 - 2 m . sum_j (x_j - old)
+    old = points[index]
+    m = new_point - old
+    return (len(points) - 1) * np.dot(m, m) - 2 * np.dot(m, np.sum(points - old, axis=0))
+
+
+def sum_dist(points, weights=None):
+    points = np.asarray(points, dtype=float)
+    return np.sum(_pairwise_distances(points), axis=(-2, -1)) / 2
+
+def sum_dist_delta(points, index, new_point, weights=None):
+    old = points[index]
+    # The j = index terms are |old - new| and 0; drop the first
+    return (np.sum(np.linalg.norm(points - new_point, axis=1)) - np.linalg.norm(old - new_point)
+            - np.sum(np.linalg.norm(points - old, axis=1)))
+
+
+def max_min(points, weights=None):
+    """Smallest pairwise distance (max-min dispersion)."""
+    points = np.asarray(points, dtype=float)
+    k = points.shape[-2]
+    if k < 2:
+        return np.zeros(points.shape[:-2])
+    distances = _pairwise_distances(points) + np.diag(np.full(k, np.inf))
+    return np.min(distances, axis=(-2, -1))
+
+
+# sum_{i<j} w_i w_j |x_i - x_j|^2 = W * sum_i w_i |x_i - c_w|^2 with W = sum w and c_w the
+# weighted centroid; equal weights give sum_sq.
+def weighted_sum_sq(points, weights=None):
+    points = np.asarray(points, dtype=float)
+    w = np.ones(points.shape[-2]) if weights is None else np.asarray(weights, dtype=float)
+    total = np.sum(w)
+    centroid = np.sum(w[:, None] * points, axis=-2, keepdims=True) / total
+    return total * np.sum(w[:, None] * (points - centroid) ** 2, axis=(-2, -1))
+
+def weighted_sum_sq_delta(points, index, new_point, weights=None):
+    w = np.ones(len(points)) if weights is None else np.asarray(weights, dtype=float)
+    old = points[index]
+    m = new_point - old
+    return w[index] * ((np.sum(w) - w[index]) * np.dot(m, m)
+                       - 2 * np.dot(m, np.sum(w[:, None] * (points - old), axis=0)))
+
+
+OBJECTIVES = {
+    "sum_sq": Objective(sum_sq, sum_sq_delta),
+    "sum": Objective(sum_dist, sum_dist_delta),
+    "max_min": Objective(max_min, None),
+    "weighted": Objective(weighted_sum_sq, weighted_sum_sq_delta),
+}
+
+
+def register_objective(name, batch, delta=None):
+    OBJECTIVES[name] = Objective(batch, delta)
+
+def get_objective(objective):
+    """Look an objective up by name; an Objective passes straight through."""
+    if isinstance(objective, Objective):
+        return objective
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}'. Choose from {list(OBJECTIVES)}")
+    return OBJECTIVES[objective]
+
+def score(points, objective="sum_sq", weights=None):
+    """Score of a single (k, d) placement as a float."""
+    return float(get_objective(objective).batch(points, weights))
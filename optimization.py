@@ -2,13 +2,19 @@ import numpy as np
 import random
 from convexpolygon import is_inside
 from scipy.spatial.distance import pdist, squareform
+from objectives import get_objective, sum_sq
+from polytope import as_region, is_region_object
+from repair import repair, region_halfplanes
+from checkpoint import run_fingerprint
+from history import FitnessHistory, RunResult, population_diversity, resume_history
+from warm_start import as_population
 
 def fitness_function(points):
     pairwise_distances = pdist(points)
     if len(pairwise_distances) == 0:
         return 0, None, None
 
-    fitness = np.sum(pairwise_distances ** 2)
+    fitness = float(sum_sq(points))
     dist_matrix = squareform(pairwise_distances)
 
     return fitness, None, dist_matrix
@@ -21,41 +27,82 @@ def select_parents(population, fitness_scores):
     return selected[0], selected[1]
 
 # --- Corrected Uniform Crossover ---
-def crossover(parent1, parent2, polygon):
+def crossover(parent1, parent2, polygon, repair_strategy="resample", halfplanes=None):
     child1 = np.copy(parent1)
     child2 = np.copy(parent2)
     for i in range(len(parent1)):
         if random.random() < 0.5:  # uniform crossover
             child1[i], child2[i] = parent2[i], parent1[i]
     # Ensure points inside polygon
-    child1 = np.array([p if is_inside(p, polygon) else get_random_point_in_polygon(polygon) for p in child1])
-    child2 = np.array([p if is_inside(p, polygon) else get_random_point_in_polygon(polygon) for p in child2])
+    child1 = repair(child1, polygon, repair_strategy, previous=parent1, halfplanes=halfplanes)
+    child2 = repair(child2, polygon, repair_strategy, previous=parent2, halfplanes=halfplanes)
     return child1, child2
 
 # --- Mutation ---
-def mutate(child, polygon, mutation_rate=0.1):
+def mutate(child, polygon, mutation_rate=0.1, repair_strategy="resample", halfplanes=None):
+    previous = np.copy(child)
     for i in range(len(child)):
         if random.random() < mutation_rate:
-            dx, dy = np.random.uniform(-1, 1, size=2)
-            new_point = child[i] + [dx, dy]
-            if is_inside(new_point, polygon):
-                child[i] = new_point
-            else:
-                child[i] = get_random_point_in_polygon(polygon)
+            child[i] = child[i] + np.random.uniform(-1, 1, size=child.shape[1])
+    return repair(child, polygon, repair_strategy, previous=previous, halfplanes=halfplanes)
+
+# --- Immigration: replace points by fresh uniform points ---
+# Keeps new material flowing in when crossover of near-identical parents and a low
+# mutation rate would otherwise let the population collapse onto one placement
+def immigrate(child, polygon, immigration_rate=0.05):
+    replace = np.random.rand(len(child)) < immigration_rate
+    if np.any(replace):
+        child = np.copy(child)
+        for i in np.flatnonzero(replace):
+            child[i] = get_random_point_in_polygon(polygon)
     return child
 
 # --- Main Genetic Algorithm ---
-def genetic_algorithm(polygon, test_points, pop_size, generations, mutation_rate, crossover_rate):
-    population = [np.copy(test_points) for _ in range(pop_size)]
-    best_solution = None
-    best_fitness = -np.inf
-    fitness_history = []
+def genetic_algorithm(polygon, test_points, pop_size, generations, mutation_rate, crossover_rate, callback=None,
+                      checkpoints=None, checkpointer=None, repair_strategy="resample",
+                      objective="sum_sq", weights=None, initial_points=None, history=None, halfplanes=None,
+                      immigration_rate=0.05):
+    evaluate = get_objective(objective).batch
+    polygon = as_region(polygon)
+    if halfplanes is None:
+        halfplanes = region_halfplanes(polygon)
+    checkpoints = set(checkpoints or ())
+    restored = None
+    if checkpointer is not None:
+        restored = checkpointer.restore("GA", run_fingerprint(
+            polygon, len(test_points), objective, weights, test_points=np.asarray(test_points), pop_size=pop_size,
+            generations=generations, mutation_rate=mutation_rate, crossover_rate=crossover_rate,
+            repair_strategy=repair_strategy, initial_points=initial_points, immigration_rate=immigration_rate))
+    if restored is not None:
+        population = restored["population"]
+        best_solution, best_fitness = restored["best_solution"], restored["best_fitness"]
+        fitness_history = resume_history(history, restored["fitness_history"])
+        snapshots = restored["snapshots"]
+        start_generation = restored["next_iteration"]
+    else:
+        # Seeded individuals come first; the rest start as copies of test_points
+        seeds = [] if initial_points is None else list(as_population(initial_points, *test_points.shape)[:pop_size])
+        population = seeds + [np.copy(test_points) for _ in range(pop_size - len(seeds))]
+        best_solution = None
+        best_fitness = -np.inf
+        fitness_history = history if history is not None else FitnessHistory()
+        fitness_history.reserve(generations)
+        snapshots = {}  # generations completed -> (best_solution, best_fitness)
+        start_generation = 0
 
-    for generation in range(generations):
-        fitness_scores = [fitness_function(ind)[0] for ind in population]
+    def checkpoint_state():
+        return {
+            "optimizer": "GA", "next_iteration": generation + 1,
+            "population": population, "best_solution": best_solution, "best_fitness": best_fitness,
+            "fitness_history": fitness_history, "snapshots": snapshots,
+        }
+
+    for generation in range(start_generation, generations):
+        fitness_scores = evaluate(np.array(population), weights)
 
         current_best_fitness = max(fitness_scores)
-        fitness_history.append(current_best_fitness)
+        fitness_history.record(generation, current_best_fitness, mean=lambda: np.mean(fitness_scores),
+                               diversity=lambda: population_diversity(population))
 
         current_best_idx = np.argmax(fitness_scores)
         current_best = population[current_best_idx]
@@ -63,18 +110,28 @@ def genetic_algorithm(polygon, test_points, pop_size, generations, mutation_rate
             best_solution = current_best
             best_fitness = current_best_fitness
 
+        if generation + 1 in checkpoints:
+            snapshots[generation + 1] = (np.copy(best_solution), float(best_fitness))
+
+        # callback(generation, best_solution, best_fitness) may return True to stop early
+        if callback is not None and callback(generation, best_solution, best_fitness):
+            break
+
         new_population = [best_solution]  # Elitism
 
         while len(new_population) < pop_size:
             parent1, parent2 = select_parents(population, fitness_scores)
 
             if random.random() < crossover_rate:
-                child1, child2 = crossover(parent1, parent2, polygon)
+                child1, child2 = crossover(parent1, parent2, polygon, repair_strategy, halfplanes)
             else:
                 child1, child2 = np.copy(parent1), np.copy(parent2)
 
-            child1 = mutate(child1, polygon, mutation_rate)
-            child2 = mutate(child2, polygon, mutation_rate)
+            child1 = mutate(child1, polygon, mutation_rate, repair_strategy, halfplanes)
+            child2 = mutate(child2, polygon, mutation_rate, repair_strategy, halfplanes)
+
+            child1 = immigrate(child1, polygon, immigration_rate)
+            child2 = immigrate(child2, polygon, immigration_rate)
 
             child1 = ensure_valid(child1, test_points, polygon)
             child2 = ensure_valid(child2, test_points, polygon)
@@ -83,17 +140,29 @@ def genetic_algorithm(polygon, test_points, pop_size, generations, mutation_rate
 
         population = new_population[:pop_size]
 
-    return best_solution, float(best_fitness), fitness_history
+        if checkpointer is not None:
+            checkpointer.end_iteration(generation, generations, checkpoint_state)
+
+    return RunResult(best_solution, float(best_fitness), fitness_history, snapshots)
 
 # --- Ensure All Points Are Valid ---
 def ensure_valid(child, reference, polygon):
-    child = np.unique(child, axis=0)
+    # Replace repeated points in place, so each point keeps the index its weight refers to
+    _, first = np.unique(child, axis=0, return_index=True)
+    duplicate = np.ones(len(child), dtype=bool)
+    duplicate[first] = False
+    if np.any(duplicate):
+        child = np.copy(child)
+        for i in np.flatnonzero(duplicate):
+            child[i] = get_random_point_in_polygon(polygon)
     while len(child) < len(reference):
         child = np.vstack((child, get_random_point_in_polygon(polygon)))
     return child
 
 # --- Generate Random Valid Point Inside Polygon ---
 def get_random_point_in_polygon(polygon):
+    if is_region_object(polygon):
+        return polygon.sample(1)[0]
     x_min, y_min = np.min(polygon, axis=0)
     x_max, y_max = np.max(polygon, axis=0)
     while True:
@@ -101,3 +170,146 @@ def get_random_point_in_polygon(polygon):
         y_rand = np.random.uniform(y_min, y_max)
         if is_inside((x_rand, y_rand), polygon):
             return np.array([x_rand, y_rand])
+
+# --- Island-model GA ---
+# Sub-populations evolve independently in worker processes as (P, k, d) arrays and
+# exchange their best individuals every `migration_interval` generations.
+
+# --- Tournament Selection: O(tournament_size) per parent ---
+def tournament_select(fitness_scores, n, tournament_size=3):
+    contestants = np.random.randint(len(fitness_scores), size=(n, tournament_size))
+    winners = np.argmax(fitness_scores[contestants], axis=1)
+    return contestants[np.arange(n), winners]
+
+def evolve_island(task):
+    # The island draws from its own seed; the caller's global stream is restored afterwards,
+    # so an island run in-process (processes=1) matches one run in a worker
+    state = np.random.get_state()
+    np.random.seed(task[-1])
+    try:
+        return _evolve_island(*task[:-1])
+    finally:
+        np.random.set_state(state)
+
+def _evolve_island(polygon, population, generations, mutation_rate, crossover_rate, mutation_step,
+                   tournament_size, repair_strategy, objective, weights):
+    evaluate = get_objective(objective).batch
+    halfplanes = region_halfplanes(polygon)
+    pop_size, k, dim = population.shape
+    history = []
+
+    fitness_scores = evaluate(population, weights)
+    for _ in range(generations):
+        elite_idx = np.argmax(fitness_scores)
+        elite = np.copy(population[elite_idx])
+        history.append(fitness_scores[elite_idx])
+
+        n_pairs = (pop_size + 1) // 2
+        parents1 = population[tournament_select(fitness_scores, n_pairs, tournament_size)]
+        parents2 = population[tournament_select(fitness_scores, n_pairs, tournament_size)]
+
+        # Uniform crossover, applied per pair with probability crossover_rate
+        swap = np.random.rand(n_pairs, k) < 0.5
+        swap &= (np.random.rand(n_pairs) < crossover_rate)[:, None]
+        child1 = np.where(swap[..., None], parents2, parents1)
+        child2 = np.where(swap[..., None], parents1, parents2)
+        children = np.concatenate((child1, child2))[:pop_size]
+
+        mutate_mask = np.random.rand(pop_size, k) < mutation_rate
+        mutated = children + mutate_mask[..., None] * np.random.uniform(-mutation_step, mutation_step, children.shape)
+        children = repair(mutated, polygon, repair_strategy, previous=children, halfplanes=halfplanes)
+
+        children[0] = elite  # Elitism
+        population = children
+        fitness_scores = evaluate(population, weights)
+
+    best_idx = np.argmax(fitness_scores)
+    history.append(fitness_scores[best_idx])
+    return population, history[1:]
+
+def migrate(islands, fitnesses, migration_rate, topology, objective="sum_sq", weights=None):
+    n_islands = len(islands)
+    n_migrants = max(1, int(round(migration_rate * len(islands[0]))))
+    emigrants = [isl[np.argsort(fit)[-n_migrants:]] for isl, fit in zip(islands, fitnesses)]
+
+    if topology == "ring":
+        sources = [(i - 1) % n_islands for i in range(n_islands)]
+    elif topology == "random":
+        sources = np.random.permutation(n_islands)
+        sources = [s if s != i else (i - 1) % n_islands for i, s in enumerate(sources)]
+    elif topology == "fully_connected":
+        sources = None
+    else:
+        raise ValueError(f"Unknown migration topology '{topology}'")
+
+    for i in range(n_islands):
+        if sources is None:
+            pool = np.concatenate([emigrants[j] for j in range(n_islands) if j != i])
+            incoming = pool[np.argsort(get_objective(objective).batch(pool, weights))[-n_migrants:]]
+        else:
+            incoming = emigrants[sources[i]]
+        worst = np.argsort(fitnesses[i])[:n_migrants]
+        islands[i][worst] = incoming
+    return islands
+
+def island_genetic_algorithm(polygon, k, n_islands=4, island_size=50, generations=100,
+                             mutation_rate=0.1, crossover_rate=0.8, mutation_step=1.0,
+                             tournament_size=3, migration_interval=20, migration_rate=0.1,
+                             migration_topology="ring", repair_strategy="resample", processes=None,
+                             test_points=None, seed=None, objective="sum_sq", weights=None,
+                             initial_points=None, history=None):
+    from multiprocessing import Pool
+    from pso_optimizer import generate_valid_points
+
+    evaluate = get_objective(objective).batch
+    polygon = as_region(polygon)
+    if seed is not None:
+        np.random.seed(seed)
+    islands = [np.array([generate_valid_points(k, polygon) for _ in range(island_size)])
+               for _ in range(n_islands)]
+    if test_points is not None:
+        for island in islands:
+            island[0] = test_points
+    if initial_points is not None:
+        # Every island starts from the seeds, after any test_points
+        seeds = as_population(initial_points, k, islands[0].shape[2])
+        head = int(test_points is not None)
+        for island in islands:
+            n = min(len(seeds), island_size - head)
+            island[head:head + n] = seeds[:n]
+
+    processes = n_islands if processes is None else processes
+    pool = Pool(processes) if processes > 1 else None
+    mapper = pool.map if pool is not None else map
+
+    fitness_history = history if history is not None else FitnessHistory()
+    fitness_history.reserve(generations)
+    best_so_far = -np.inf
+    generation = 0
+    try:
+        while generation < generations:
+            epoch = min(migration_interval, generations - generation)
+            seeds = np.random.randint(2 ** 31 - 1, size=n_islands)
+            tasks = [(polygon, isl, epoch, mutation_rate, crossover_rate, mutation_step, tournament_size,
+                      repair_strategy, objective, weights, s) for isl, s in zip(islands, seeds)]
+            results = list(mapper(evolve_island, tasks))
+
+            islands = [pop for pop, _ in results]
+            epoch_best = np.max([hist for _, hist in results], axis=0)
+            for offset, value in enumerate(epoch_best):
+                best_so_far = max(value, best_so_far)
+                fitness_history.record(generation + offset, best_so_far)
+            generation += epoch
+
+            fitnesses = [evaluate(isl, weights) for isl in islands]
+            if generation < generations and n_islands > 1:
+                islands = migrate(islands, fitnesses, migration_rate, migration_topology, objective, weights)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    fitnesses = [evaluate(isl, weights) for isl in islands]
+    best_island = int(np.argmax([np.max(f) for f in fitnesses]))
+    best_idx = int(np.argmax(fitnesses[best_island]))
+    return RunResult(islands[best_island][best_idx], float(fitnesses[best_island][best_idx]), fitness_history)
@@ -31,7 +31,9 @@ def plot_polygon(polygon, test_points, fitness_history=None):
 
     if fitness_history is not None:
         plt.figure(figsize=(8, 4))
-        plt.plot(fitness_history, color='#228B22', linewidth=2.5, marker='o')  # Forest Green
+        x_vals = getattr(fitness_history, "iterations", np.arange(len(fitness_history)))
+        plt.plot(x_vals, np.asarray(fitness_history), color='#228B22', linewidth=2.5,
+                 drawstyle='steps-post')  # Forest Green
         plt.title('GA Fitness Over Generations', fontsize=16, color='#333333')
         plt.xlabel('Generation', fontsize=14, color='#333333')
         plt.ylabel('Fitness Score', fontsize=14, color='#333333')
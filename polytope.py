@@ -0,0 +1,199 @@
+import numpy as np
+from scipy.optimize import linprog
+from scipy.spatial import ConvexHull, HalfspaceIntersection
+
+# --- Convex polytopes in d dimensions ---
+# A Polytope keeps both descriptions of a convex region: its vertices and its half-spaces
+# A @ x <= b with unit-length rows in A. Containment is a single matrix product, so it
+# scales with d and the facet count rather than with a 2-D ray-cast.
+#
+# Plain (n, 2) vertex arrays keep working everywhere; the helpers at the bottom of this
+# module let the optimizers treat either form as a "region".
+
+
+class Polytope:
+    def __init__(self, vertices, A, b):
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.A = np.asarray(A, dtype=float)
+        self.b = np.asarray(b, dtype=float)
+        self.dim = self.A.shape[1]
+        self.lower = np.min(self.vertices, axis=0)
+        self.upper = np.max(self.vertices, axis=0)
+        self.centre = chebyshev_centre(self.A, self.b)
+
+    @classmethod
+    def from_vertices(cls, vertices):
+        vertices = np.asarray(vertices, dtype=float)
+        hull = ConvexHull(vertices)
+        A, b = _unique_halfspaces(hull.equations[:, :-1], -hull.equations[:, -1])
+        return cls(vertices[hull.vertices], A, b)
+
+    @classmethod
+    def from_halfspaces(cls, A, b):
+        A = np.asarray(A, dtype=float)
+        b = np.asarray(b, dtype=float)
+        norms = np.linalg.norm(A, axis=1)
+        A, b = A / norms[:, None], b / norms
+        interior = chebyshev_centre(A, b)
+        vertices = HalfspaceIntersection(np.column_stack((A, -b)), interior).intersections
+        # Degenerate vertices (more than d facets meeting) come back once per facet combination
+        _, keep = np.unique(np.round(vertices, 9), axis=0, return_index=True)
+        return cls(vertices[np.sort(keep)], A, b)
+
+    @classmethod
+    def box(cls, lower, upper):
+        lower = np.asarray(lower, dtype=float)
+        upper = np.asarray(upper, dtype=float)
+        eye = np.eye(len(lower))
+        return cls.from_halfspaces(np.vstack((eye, -eye)), np.concatenate((upper, -lower)))
+
+    @classmethod
+    def simplex(cls, dim, scale=1.0):
+        return cls.from_vertices(scale * np.vstack((np.zeros(dim), np.eye(dim))))
+
+    @property
+    def halfplanes(self):
+        """(normals, offsets, vertices), the same layout as repair.polygon_halfplanes()."""
+        return self.A, self.b, self.vertices
+
+    def contains(self, points, tol=1e-9):
+        points = np.asarray(points, dtype=float)
+        return np.all(points @ self.A.T <= self.b + tol * (1 + np.abs(self.b)), axis=-1)
+
+    def sample(self, n, burn_in=None):
+        """n points uniformly from the polytope.
+
+        Rejection sampling from the bounding box while that accepts often enough, and
+        vectorized hit-and-run chains started at the Chebyshev centre otherwise.
+        """
+        if n == 0:
+            return np.empty((0, self.dim))
+        batch = np.random.uniform(self.lower, self.upper, (max(4 * n, 64), self.dim))
+        accepted = batch[self.contains(batch)]
+        if len(accepted) >= n:
+            return accepted[:n]
+        if len(accepted) / len(batch) > 0.05:
+            return np.vstack((accepted, self.sample(n - len(accepted))))
+        return self.hit_and_run(n, burn_in or 10 * self.dim + 20)
+
+    def hit_and_run(self, n, steps):
+        x = np.tile(self.centre, (n, 1))
+        for _ in range(steps):
+            u = np.random.normal(size=(n, self.dim))
+            u /= np.linalg.norm(u, axis=1, keepdims=True)
+            t_min, t_max = self.chord(x, u)
+            x = x + np.random.uniform(t_min, t_max)[:, None] * u
+        return x
+
+    def chord(self, x, u):
+        """Parameter range [t_min, t_max] for which x + t u stays inside, per row."""
+        along = u @ self.A.T
+        slack = self.b - x @ self.A.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = slack / along
+        t_max = np.min(np.where(along > 0, ratios, np.inf), axis=1)
+        t_min = np.max(np.where(along < 0, ratios, -np.inf), axis=1)
+        return np.minimum(t_min, 0.0), np.maximum(t_max, 0.0)
+
+    def sample_boundary(self, n):
+        """Boundary points found by shooting rays from the centre in random directions."""
+        u = np.random.normal(size=(n, self.dim))
+        u /= np.linalg.norm(u, axis=1, keepdims=True)
+        x = np.tile(self.centre, (n, 1))
+        _, t_max = self.chord(x, u)
+        return x + t_max[:, None] * u
+
+    def project(self, points, iterations=50, tol=1e-10):
+        """Nearest points inside the polytope, by Dykstra's alternating projections."""
+        points = np.array(points, dtype=float)
+        outside = ~self.contains(points)
+        if not np.any(outside):
+            return points
+
+        # Most points only cross one facet: if the projection onto the most violated
+        # half-space lands inside, it is already the nearest point of the polytope
+        x = points[outside]
+        violation = x @ self.A.T - self.b
+        facet = np.argmax(violation, axis=1)
+        single = x - violation[np.arange(len(x)), facet][:, None] * self.A[facet]
+        done = self.contains(single)
+        points[np.flatnonzero(outside)[done]] = single[done]
+        outside[np.flatnonzero(outside)[done]] = False
+        if not np.any(outside):
+            return points
+
+        x = points[outside]
+        increments = np.zeros((len(self.b),) + x.shape)
+        for _ in range(iterations):
+            sweep_start = x
+            for i, (a, b) in enumerate(zip(self.A, self.b)):
+                y = x + increments[i]
+                x = y - np.maximum(y @ a - b, 0.0)[:, None] * a
+                increments[i] = y - x
+            if np.max(np.abs(x - sweep_start)) <= tol * (1 + np.max(np.abs(x))):
+                break
+        # Finish exactly inside: walk any residual violation back towards the centre
+        still_out = ~self.contains(x)
+        if np.any(still_out):
+            start = np.tile(self.centre, (int(np.sum(still_out)), 1))
+            u = x[still_out] - start
+            _, t_max = self.chord(start, u)
+            x[still_out] = start + np.minimum(t_max, 1.0)[:, None] * u
+        points[outside] = x
+        return points
+
+
+def chebyshev_centre(A, b):
+    """Centre of the largest ball inside A x <= b (rows of A are unit length)."""
+    dim = A.shape[1]
+    cost = np.zeros(dim + 1)
+    cost[-1] = -1.0
+    A_ub = np.column_stack((A, np.ones(len(A))))
+    result = linprog(cost, A_ub=A_ub, b_ub=b, bounds=[(None, None)] * dim + [(0, None)])
+    if not result.success or result.x[-1] <= 0:
+        raise ValueError("Half-spaces do not describe a bounded polytope with an interior")
+    return result.x[:-1]
+
+
+def _unique_halfspaces(A, b, decimals=10):
+    # Qhull splits non-simplicial facets (e.g. a cube face) into several coplanar simplices
+    _, keep = np.unique(np.round(np.column_stack((A, b)), decimals), axis=0, return_index=True)
+    keep = np.sort(keep)
+    return A[keep], b[keep]
+
+
+# --- Region helpers: accept a region object or a plain vertex array ---
+# Region objects (Polytope, spatial_index.GridIndex) answer contains()/sample() themselves
+# and expose dim, lower, upper, vertices and halfplanes.
+def is_polytope(region):
+    return isinstance(region, Polytope)
+
+def is_region_object(region):
+    return hasattr(region, "contains") and hasattr(region, "sample")
+
+def region_dimension(region):
+    return region.dim if is_region_object(region) else np.asarray(region).shape[1]
+
+def region_bounds(region):
+    if is_region_object(region):
+        return region.lower, region.upper
+    return np.min(region, axis=0), np.max(region, axis=0)
+
+def region_extent(region):
+    lower, upper = region_bounds(region)
+    return upper - lower
+
+def as_region(region):
+    """Region an optimizer should work on for the given vertex array.
+
+    Vertex sets in three or more dimensions become Polytopes, and non-convex or very
+    detailed 2-D polygons get a spatial_index.GridIndex; other polygons stay as they are.
+    """
+    from spatial_index import GridIndex, needs_index
+
+    if is_region_object(region):
+        return region
+    region = np.asarray(region, dtype=float)
+    if region.shape[1] != 2:
+        return Polytope.from_vertices(region)
+    return GridIndex(region) if needs_index(region) else region
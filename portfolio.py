@@ -0,0 +1,197 @@
+import multiprocessing as mp
+import queue
+import random
+import time
+import numpy as np
+from optimization import genetic_algorithm
+from polytope import as_region, region_dimension
+from pso_optimizer import particle_swarm_optimization, generate_valid_points
+from aco_optimizer import ant_colony_optimization
+from sa_optimizer import simulated_annealing
+
+# --- Portfolio racing ---
+# GA, PSO, ACO and SA run concurrently in worker processes under one wall-clock budget.
+# Each worker repeats short runs ("slices") of its optimizer and publishes improvements to a
+# shared incumbent; once there is one, every new slice starts from it. The coordinator races
+# the optimizers on their slice results and hands the slots of clearly inferior optimizers
+# over to the current leader.
+
+OPTIMIZERS = ("GA", "PSO", "ACO", "SA")
+
+# Budget of one slice per optimizer; a slice is cut short when the deadline passes
+DEFAULT_SLICE_PARAMS = {
+    "GA": {"pop_size": 50, "generations": 100, "mutation_rate": 0.1, "crossover_rate": 0.8},
+    "PSO": {"num_particles": 30, "iterations": 100, "w": 0.5, "c1": 1.5, "c2": 2.0,
+            "v_max_fraction": 0.2, "boundary": "absorb"},
+    "ACO": {"n_ants": 20, "n_iterations": 30, "alpha": 1.2, "beta": 1.2, "evaporation_rate": 0.6,
+            "q": 100, "n_candidates": 150, "candidate_strategy": "mixed", "refine_every": 10},
+    "SA": {"iterations": 2000, "initial_temp": "auto", "schedule": "adaptive", "step_size": None},
+}
+
+
+def run_slice(name, polygon, k, params, callback, initial_points=None, halfplanes=None):
+    polygon = as_region(polygon)
+    shared = dict(callback=callback, initial_points=initial_points, halfplanes=halfplanes)
+    if name == "GA":
+        test_points = generate_valid_points(k, polygon)
+        points, fitness, _ = genetic_algorithm(polygon, test_points, **shared, **params)
+    elif name == "PSO":
+        points, fitness, _ = particle_swarm_optimization(polygon, k, verbose=False, **shared, **params)
+    elif name == "ACO":
+        points, fitness, _ = ant_colony_optimization(polygon, k, verbose=False, **shared, **params)
+    elif name == "SA":
+        points, fitness, _ = simulated_annealing(polygon, k, **shared, **params)
+    else:
+        raise ValueError(f"Unknown optimizer '{name}'")
+    return points, fitness
+
+
+def _portfolio_worker(slot, name, polygon, k, params, deadline, seed, shared, stop_flag, results, warm_start):
+    np.random.seed(seed)
+    random.seed(seed)
+    incumbent_fitness, incumbent_points, incumbent_owner, lock = shared
+    owner_id = OPTIMIZERS.index(name)
+
+    def callback(iteration, best_points, best_fitness):
+        if best_fitness > incumbent_fitness.value:
+            with lock:
+                if best_fitness > incumbent_fitness.value:
+                    incumbent_fitness.value = best_fitness
+                    incumbent_points[:] = np.asarray(best_points, dtype=float).ravel()
+                    incumbent_owner.value = owner_id
+        return stop_flag.value or time.time() >= deadline
+
+    while not stop_flag.value and time.time() < deadline:
+        start = time.time()
+        seed_points = None
+        if warm_start and incumbent_owner.value >= 0:
+            with lock:
+                seed_points = np.array(incumbent_points[:]).reshape(k, -1)
+        _, fitness = run_slice(name, polygon, k, params, callback, seed_points)
+        results.put((slot, name, float(fitness), time.time() - start))
+
+
+def _race(stats, active, z):
+    """Names of optimizers whose upper confidence bound falls below the leader's lower bound."""
+    summary = {}
+    for name in active:
+        runs = stats[name]["runs"]
+        if len(runs) < 2:
+            return []
+        mean = np.mean(runs)
+        se = np.std(runs, ddof=1) / np.sqrt(len(runs))
+        summary[name] = (mean, se)
+    leader = max(summary, key=lambda n: summary[n][0])
+    leader_low = summary[leader][0] - z * summary[leader][1]
+    return [n for n, (mean, se) in summary.items() if n != leader and mean + z * se < leader_low]
+
+
+def portfolio_optimization(polygon, k, time_budget=10.0, optimizers=OPTIMIZERS, slice_params=None,
+                           race_interval=0.5, min_runs=3, z=2.0, seed=None, objective="sum_sq", weights=None,
+                           warm_start=True):
+    """Race the optimizers concurrently and return (best_points, best_fitness, report).
+
+    All optimizers maximise the same `objective` (see objectives.OBJECTIVES). Every slice
+    after the first incumbent starts from that incumbent; pass warm_start=False for
+    independent restarts. The report
+    maps each optimizer to its completed slices, mean/best slice fitness, worker-seconds
+    used, when it was eliminated (if it was) and whether it produced the returned incumbent.
+    """
+    params = {name: dict(DEFAULT_SLICE_PARAMS[name], objective=objective, weights=weights) for name in optimizers}
+    for name, overrides in (slice_params or {}).items():
+        params[name].update(overrides)
+
+    polygon = as_region(polygon)
+    dim = region_dimension(polygon)
+    rng = np.random.default_rng(seed)
+    ctx = mp.get_context()
+    lock = ctx.Lock()
+    incumbent_fitness = ctx.Value('d', -np.inf, lock=False)
+    incumbent_points = ctx.Array('d', k * dim, lock=False)
+    incumbent_owner = ctx.Value('i', -1, lock=False)
+    shared = (incumbent_fitness, incumbent_points, incumbent_owner, lock)
+    results = ctx.Queue()
+
+    start = time.time()
+    deadline = start + time_budget
+    stats = {name: {"runs": [], "worker_seconds": 0.0, "eliminated_at": None} for name in optimizers}
+    slots = {}
+
+    def launch(slot, name):
+        stop_flag = ctx.Value('b', False, lock=False)
+        proc = ctx.Process(target=_portfolio_worker,
+                           args=(slot, name, polygon, k, params[name], deadline,
+                                 int(rng.integers(2 ** 31 - 1)), shared, stop_flag, results, warm_start))
+        proc.start()
+        slots[slot] = {"name": name, "proc": proc, "stop": stop_flag, "since": time.time()}
+
+    def retire(slot):
+        entry = slots[slot]
+        entry["stop"].value = True
+        stats[entry["name"]]["worker_seconds"] += time.time() - entry["since"]
+
+    for slot, name in enumerate(optimizers):
+        launch(slot, name)
+
+    active = list(optimizers)
+    next_race = start + race_interval
+    while time.time() < deadline:
+        try:
+            slot, name, fitness, _ = results.get(timeout=min(0.05, max(deadline - time.time(), 0.001)))
+            stats[name]["runs"].append(fitness)
+        except queue.Empty:
+            pass
+
+        if time.time() >= next_race and len(active) > 1:
+            next_race += race_interval
+            if all(len(stats[n]["runs"]) >= min_runs for n in active):
+                for loser in _race(stats, active, z):
+                    active.remove(loser)
+                    stats[loser]["eliminated_at"] = time.time() - start
+                    leader = max(active, key=lambda n: np.mean(stats[n]["runs"]))
+                    for slot_id, entry in list(slots.items()):
+                        if entry["name"] == loser and not entry["stop"].value:
+                            retire(slot_id)
+                            launch(len(slots), leader)
+
+    for slot_id, entry in slots.items():
+        if not entry["stop"].value:
+            retire(slot_id)
+    for entry in slots.values():
+        entry["proc"].join(timeout=5)
+        if entry["proc"].is_alive():
+            entry["proc"].terminate()
+    while True:
+        try:
+            _, name, fitness, _ = results.get_nowait()
+            stats[name]["runs"].append(fitness)
+        except queue.Empty:
+            break
+
+    best_points = np.array(incumbent_points[:]).reshape(k, dim)
+    owner = OPTIMIZERS[incumbent_owner.value] if incumbent_owner.value >= 0 else None
+    report = {}
+    for name in optimizers:
+        runs = stats[name]["runs"]
+        report[name] = {
+            "runs": len(runs),
+            "mean_fitness": float(np.mean(runs)) if runs else None,
+            "best_fitness": float(np.max(runs)) if runs else None,
+            "worker_seconds": stats[name]["worker_seconds"],
+            "eliminated_at": stats[name]["eliminated_at"],
+            "produced_best": name == owner,
+        }
+    return best_points, float(incumbent_fitness.value), report
+
+
+if __name__ == "__main__":
+    from io_operations import get_polygon
+
+    polygon = get_polygon()
+    k = int(input("Enter number of k points: "))
+    budget = float(input("Enter time budget in seconds: "))
+    best_points, best_fitness, report = portfolio_optimization(polygon, k, time_budget=budget)
+    print(f"Best fitness (sum of squared distances): {best_fitness:.4f}")
+    print(best_points)
+    for name, row in report.items():
+        print(f"{name}: {row}")
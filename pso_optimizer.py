@@ -4,18 +4,31 @@ from scipy.spatial.distance import pdist, squareform
 import matplotlib.pyplot as plt
 import cProfile
 import time
+from objectives import score
+from polytope import as_region, is_region_object, region_dimension, region_extent
+from repair import (region_halfplanes, inside_halfplanes, project_inside,
+                    clamp_along_move, reflect_off_boundary)
+from checkpoint import run_fingerprint
+from history import FitnessHistory, RunResult, population_diversity, resume_history
+from warm_start import as_population
 
-# --- Fast point-in-polygon using Path ---
+# --- Fast point-in-polygon using Path (half-space test for a Polytope) ---
 def fast_is_inside(points, polygon):
+    if is_region_object(polygon):
+        return polygon.contains(points)
     path = Path(polygon)
     return path.contains_points(points)
 
 def fast_is_inside_single(point, polygon):
+    if is_region_object(polygon):
+        return bool(polygon.contains(point))
     path = Path(polygon)
     return path.contains_point(point)
 
 # --- Vectorized valid point generation ---
 def generate_valid_points(k, polygon):
+    if is_region_object(polygon):
+        return polygon.sample(k)
     min_x, max_x = np.min(polygon[:, 0]), np.max(polygon[:, 0])
     min_y, max_y = np.min(polygon[:, 1]), np.max(polygon[:, 1])
 
@@ -30,56 +43,194 @@ def generate_valid_points(k, polygon):
     return np.array(points[:k])
 
 # --- Ensure all points lie inside polygon ---
+# Outside points are replaced in place so each row keeps its velocity and personal best
 def ensure_inside(points, polygon):
     inside_mask = fast_is_inside(points, polygon)
     if np.all(inside_mask):
         return points
     else:
-        valid = points[inside_mask]
-        num_needed = len(points) - len(valid)
-        new_points = generate_valid_points(num_needed, polygon)
-        return np.vstack((valid, new_points))
+        points = np.copy(points)
+        outside = ~inside_mask
+        points[outside] = generate_valid_points(int(np.sum(outside)), polygon)
+        return points
+
+def apply_boundary(previous, positions, velocities, polygon, strategy, halfplanes):
+    """Bring particles that left the polygon back without reordering rows."""
+    if strategy == "resample":
+        return ensure_inside(positions, polygon), velocities
+
+    # halfplanes is None for a non-convex polygon, which is repaired through its spatial index
+    if halfplanes is None:
+        outside = ~polygon.contains(positions)
+    else:
+        normals, offsets, _ = halfplanes
+        outside = ~inside_halfplanes(positions, normals, offsets)
+    if not np.any(outside):
+        return positions, velocities
+
+    positions = np.copy(positions)
+    velocities = np.copy(velocities)
+
+    if strategy == "absorb":
+        if halfplanes is None:
+            positions[outside], _ = polygon.clamp(previous[outside], positions[outside])
+        else:
+            positions[outside] = clamp_along_move(previous[outside], positions[outside], halfplanes)
+        velocities[outside] = 0.0
+    elif strategy == "reflect":
+        if halfplanes is None:
+            positions[outside], n = polygon.reflect(previous[outside], positions[outside])
+        else:
+            positions[outside], n = reflect_off_boundary(previous[outside], positions[outside], halfplanes)
+        v = velocities[outside]
+        velocities[outside] = v - 2 * np.sum(v * n, axis=1)[:, None] * n
+    elif strategy == "project":
+        if halfplanes is None:
+            positions[outside] = polygon.project(positions[outside])
+        else:
+            positions[outside] = project_inside(positions[outside], polygon, halfplanes)
+        velocities[outside] = 0.0
+    else:
+        raise ValueError(f"Unknown boundary strategy '{strategy}'")
+    return positions, velocities
+
+# --- Neighbourhood topologies: informants[i] lists the particles particle i learns from ---
+def build_topology(topology, num_particles, neighbors=3):
+    idx = np.arange(num_particles)
+    if topology == "global":
+        return [idx] * num_particles
+    if topology == "ring":
+        return [np.unique([(i - 1) % num_particles, i, (i + 1) % num_particles]) for i in idx]
+    if topology == "von_neumann":
+        rows = int(np.floor(np.sqrt(num_particles)))
+        while num_particles % rows:
+            rows -= 1
+        cols = num_particles // rows
+        informants = []
+        for i in idx:
+            r, c = divmod(i, cols)
+            informants.append(np.unique([i,
+                                         ((r - 1) % rows) * cols + c, ((r + 1) % rows) * cols + c,
+                                         r * cols + (c - 1) % cols, r * cols + (c + 1) % cols]))
+        return informants
+    if topology == "random":
+        # Each particle informs itself and `neighbors` random others (Clerc's adaptive random topology)
+        links = [{i} for i in idx]
+        for i in idx:
+            for j in np.random.randint(num_particles, size=neighbors):
+                links[j].add(i)
+        return [np.array(sorted(l)) for l in links]
+    raise ValueError(f"Unknown topology '{topology}'")
+
+def constriction_coefficient(c1, c2):
+    phi = c1 + c2
+    if phi <= 4:
+        raise ValueError("Constriction needs c1 + c2 > 4 (e.g. c1 = c2 = 2.05)")
+    return 2 / abs(2 - phi - np.sqrt(phi ** 2 - 4 * phi))
 
 # --- Optimized evaluate function ---
 # --- Optimized evaluate function using sum of squared distances ---
-def evaluate(points):
-    distances = pdist(points)
-    return np.sum(distances ** 2)
+def evaluate(points, objective="sum_sq", weights=None):
+    return score(points, objective, weights)
 
 
 # --- Particle Swarm Optimization with timestamps, elitism, and history tracking ---
-def particle_swarm_optimization(polygon, k, num_particles=30, iterations=100, w=0.7, c1=1.5, c2=1.5):
-    positions = [generate_valid_points(k, polygon) for _ in range(num_particles)]
-    velocities = [np.random.uniform(-1, 1, (k, 2)) for _ in range(num_particles)]
-    best_positions = [np.copy(pos) for pos in positions]
-    best_fitnesses = [evaluate(pos) for pos in positions]
+def particle_swarm_optimization(polygon, k, num_particles=30, iterations=100, w=0.7, c1=1.5, c2=1.5,
+                                topology="global", neighbors=3, constriction=False,
+                                v_max_fraction=None, boundary="resample", callback=None, verbose=True,
+                                checkpoints=None, checkpointer=None, objective="sum_sq", weights=None,
+                                initial_points=None, history=None, halfplanes=None, v_init_fraction=0.25):
+    polygon = as_region(polygon)
+    dim = region_dimension(polygon)
+    extent = region_extent(polygon)
+    v_max = v_max_fraction * extent if v_max_fraction is not None else None
+    # Initial velocities scale with the region whether or not they are clamped
+    init_speed = v_max if v_max is not None else v_init_fraction * extent
+    chi = constriction_coefficient(c1, c2) if constriction else None
+    if halfplanes is None:
+        halfplanes = region_halfplanes(polygon)
 
-    global_best_idx = np.argmax(best_fitnesses)
-    global_best_position = np.copy(best_positions[global_best_idx])
-    global_best_fitness = best_fitnesses[global_best_idx]
+    checkpoints = set(checkpoints or ())
+    restored = None
+    if checkpointer is not None:
+        restored = checkpointer.restore("PSO", run_fingerprint(
+            polygon, k, objective, weights, num_particles=num_particles, iterations=iterations, w=w, c1=c1,
+            c2=c2, topology=topology, neighbors=neighbors, constriction=constriction,
+            v_max_fraction=v_max_fraction, boundary=boundary, initial_points=initial_points,
+            v_init_fraction=v_init_fraction))
+    if restored is not None:
+        positions, velocities = restored["positions"], restored["velocities"]
+        best_positions, best_fitnesses = restored["best_positions"], restored["best_fitnesses"]
+        global_best_position = restored["global_best_position"]
+        global_best_fitness = restored["global_best_fitness"]
+        informants = restored["informants"]
+        history = resume_history(history, restored["history"])
+        snapshots = restored["snapshots"]
+        start_iteration = restored["next_iteration"]
+    else:
+        # Seeded particles come first; the rest of the swarm starts at random
+        seeds = [] if initial_points is None else list(as_population(initial_points, k, dim)[:num_particles])
+        positions = seeds + [generate_valid_points(k, polygon) for _ in range(num_particles - len(seeds))]
+        velocities = [np.random.uniform(-1, 1, (k, dim)) * init_speed for _ in range(num_particles)]
+        best_positions = [np.copy(pos) for pos in positions]
+        best_fitnesses = [evaluate(pos, objective, weights) for pos in positions]
+
+        global_best_idx = np.argmax(best_fitnesses)
+        global_best_position = np.copy(best_positions[global_best_idx])
+        global_best_fitness = best_fitnesses[global_best_idx]
+
+        informants = build_topology(topology, num_particles, neighbors)
+
+        if history is None:
+            history = FitnessHistory()  # Track fitness history over iterations
+        history.reserve(iterations)
+        snapshots = {}  # iterations completed -> (best_position, best_fitness)
+        start_iteration = 0
 
-    history = []  # Track fitness history over iterations
+    def checkpoint_state():
+        return {
+            "optimizer": "PSO", "next_iteration": iteration + 1,
+            "positions": positions, "velocities": velocities,
+            "best_positions": best_positions, "best_fitnesses": best_fitnesses,
+            "global_best_position": global_best_position, "global_best_fitness": global_best_fitness,
+            "informants": informants, "history": history, "snapshots": snapshots,
+        }
 
-    print("\n--- Starting PSO ---")
+    if verbose:
+        print("\n--- Starting PSO ---")
     start_time = time.time()
-    for iteration in range(iterations):
+    for iteration in range(start_iteration, iterations):
         iter_start = time.time()
+        improved = False
 
         # Apply elitism: preserve the best particle
         elite_position = np.copy(global_best_position)
         elite_fitness = global_best_fitness
 
         for i in range(num_particles):
-            r1 = np.random.rand(k, 2)
-            r2 = np.random.rand(k, 2)
+            if topology == "global":
+                social_best = global_best_position
+            else:
+                nbrs = informants[i]
+                social_best = best_positions[nbrs[np.argmax([best_fitnesses[j] for j in nbrs])]]
+
+            r1 = np.random.rand(k, dim)
+            r2 = np.random.rand(k, dim)
             cognitive = c1 * r1 * (best_positions[i] - positions[i])
-            social = c2 * r2 * (global_best_position - positions[i])
-            velocities[i] = w * velocities[i] + cognitive + social
+            social = c2 * r2 * (social_best - positions[i])
+            if chi is not None:
+                velocities[i] = chi * (velocities[i] + cognitive + social)
+            else:
+                velocities[i] = w * velocities[i] + cognitive + social
+            if v_max is not None:
+                velocities[i] = np.clip(velocities[i], -v_max, v_max)
 
-            positions[i] += velocities[i]
-            positions[i] = ensure_inside(positions[i], polygon)
+            previous = positions[i]
+            positions[i] = positions[i] + velocities[i]
+            positions[i], velocities[i] = apply_boundary(
+                previous, positions[i], velocities[i], polygon, boundary, halfplanes)
 
-            fitness = evaluate(positions[i])
+            fitness = evaluate(positions[i], objective, weights)
             if fitness > best_fitnesses[i]:
                 best_fitnesses[i] = fitness
                 best_positions[i] = np.copy(positions[i])
@@ -87,21 +238,36 @@ def particle_swarm_optimization(polygon, k, num_particles=30, iterations=100, w=
                 if fitness > global_best_fitness:
                     global_best_fitness = fitness
                     global_best_position = np.copy(positions[i])
+                    improved = True
 
         # Replace worst particle with elite if needed
         worst_idx = np.argmin(best_fitnesses)
         best_positions[worst_idx] = elite_position
         best_fitnesses[worst_idx] = elite_fitness
 
-        history.append(global_best_fitness)  # Save best fitness for this iteration
+        if topology == "random" and not improved:
+            informants = build_topology(topology, num_particles, neighbors)
+
+        history.record(iteration, global_best_fitness, mean=lambda: np.mean(best_fitnesses),
+                       diversity=lambda: population_diversity(positions))
+        if iteration + 1 in checkpoints:
+            snapshots[iteration + 1] = (np.copy(global_best_position), global_best_fitness)
 
-        if (iteration + 1) % 100 == 0 or iteration == iterations - 1:
+        # callback(iteration, best_position, best_fitness) may return True to stop early
+        if callback is not None and callback(iteration, global_best_position, global_best_fitness):
+            break
+
+        if verbose and ((iteration + 1) % 100 == 0 or iteration == iterations - 1):
             iter_end = time.time()
             print(f"Iteration {iteration+1}/{iterations} completed in {iter_end - iter_start:.2f}s - Timestamp: {time.strftime('%H:%M:%S')} | Best Fitness: {global_best_fitness:.4f}")
 
+        if checkpointer is not None:
+            checkpointer.end_iteration(iteration, iterations, checkpoint_state)
+
     total_time = time.time() - start_time
-    print(f"--- PSO completed in {total_time:.2f} seconds ---\n")
-    return global_best_position, global_best_fitness, history
+    if verbose:
+        print(f"--- PSO completed in {total_time:.2f} seconds ---\n")
+    return RunResult(global_best_position, global_best_fitness, history, snapshots)
 
 # --- Optional: Profiling toggle ---
 def run_with_profiling():
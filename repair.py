@@ -0,0 +1,150 @@
+import numpy as np
+from scipy.spatial import ConvexHull
+from polytope import as_region, is_polytope, is_region_object
+from spatial_index import GridIndex
+
+# --- Constraint repair ---
+# Vectorized ways of bringing points that left a region back inside, for any (..., d)
+# batch of points: a single placement (k, d), a population (P, k, d), and so on. The
+# region is anything polytope.as_region accepts; raw vertex arrays are converted first.
+# Non-convex polygons (a spatial_index.GridIndex) have no half-plane form; there clamp
+# stops just before the first edge the move crosses (GridIndex.first_crossing), reflect
+# bounces off that edge and project nudges the nearest boundary point inward.
+#
+#   resample - replace by a fresh uniform point (the original behaviour)
+#   revert   - go back to the previous position
+#   clamp    - stop where the move from the previous position crosses the boundary
+#   reflect  - bounce off the boundary facet that was crossed
+#   project  - nearest point on the boundary
+#
+# clamp, reflect and project keep the progress a move made towards the boundary, which
+# is where the optimal placements lie.
+
+REPAIR_STRATEGIES = ("resample", "revert", "clamp", "reflect", "project")
+
+
+# --- Half-plane form of a convex polygon: normals @ x <= offsets ---
+def polygon_halfplanes(polygon):
+    if is_region_object(polygon):
+        return polygon.halfplanes
+    hull = ConvexHull(polygon)
+    normals = hull.equations[:, :-1]
+    offsets = -hull.equations[:, -1]
+    return normals, offsets, polygon[hull.vertices]
+
+def region_halfplanes(polygon):
+    """polygon_halfplanes(), or None for a non-convex polygon."""
+    return None if _nonconvex_index(polygon) else polygon_halfplanes(polygon)
+
+def _nonconvex_index(polygon):
+    return isinstance(polygon, GridIndex) and not polygon.convex
+
+def inside_halfplanes(points, normals, offsets, tol=1e-9):
+    return np.all(points @ normals.T <= offsets + tol, axis=-1)
+
+def _exit_fraction(start, move, normals, offsets):
+    """Fraction of `move` from `start` that stays inside, and the facet that is hit first."""
+    along = move @ normals.T
+    slack = offsets - start @ normals.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(along > 0, slack / along, np.inf)
+    facet = np.argmin(t, axis=-1)
+    t_hit = np.clip(np.take_along_axis(t, facet[:, None], axis=-1)[:, 0], 0.0, 1.0)
+    return t_hit, facet
+
+def project_onto_polygon(points, hull_vertices):
+    """Nearest point on the polygon boundary for each row of `points`."""
+    a = hull_vertices
+    b = np.roll(hull_vertices, -1, axis=0)
+    edge = b - a
+    rel = points[:, None, :] - a[None, :, :]
+    t = np.clip(np.sum(rel * edge, axis=-1) / np.sum(edge * edge, axis=-1), 0.0, 1.0)
+    candidates = a[None, :, :] + t[..., None] * edge[None, :, :]
+    nearest = np.argmin(np.sum((candidates - points[:, None, :]) ** 2, axis=-1), axis=1)
+    return candidates[np.arange(len(points)), nearest]
+
+def project_inside(points, polygon, halfplanes):
+    """Nearest point of the region: exact edge projection in 2-D, Dykstra for a Polytope."""
+    if is_polytope(polygon):
+        return polygon.project(points)
+    return project_onto_polygon(points, halfplanes[2])
+
+def clamp_along_move(start, end, halfplanes):
+    normals, offsets, _ = halfplanes
+    move = end - start
+    t_hit, _ = _exit_fraction(start, move, normals, offsets)
+    return start + t_hit[:, None] * move
+
+def reflect_off_boundary(start, end, halfplanes):
+    """Reflect the part of each move beyond the boundary; returns (points, facet normals hit)."""
+    normals, offsets, _ = halfplanes
+    move = end - start
+    t_hit, facet = _exit_fraction(start, move, normals, offsets)
+    hit = start + t_hit[:, None] * move
+    n = normals[facet]
+    mirrored = move - 2 * np.sum(move * n, axis=1)[:, None] * n
+    remaining = (1 - t_hit)[:, None] * mirrored
+    # A second crossing (e.g. near a corner) is clamped rather than bounced again
+    t_second, _ = _exit_fraction(hit, remaining, normals, offsets)
+    return hit + t_second[:, None] * remaining, n
+
+
+def repair(points, polygon, strategy="resample", previous=None, halfplanes=None):
+    """Return a copy of `points` with every point inside `polygon`.
+
+    `previous` holds the positions the points moved from (same shape, all inside) and is
+    required for revert and reflect; clamp without it pulls points towards the centroid
+    of the hull instead (or to the nearest boundary point of a non-convex polygon).
+    `halfplanes` are region_halfplanes() of an already resolved region; passing them skips
+    resolving `polygon` again, which optimizers rely on in their inner loops.
+    """
+    if strategy not in REPAIR_STRATEGIES:
+        raise ValueError(f"Unknown repair strategy '{strategy}'. Choose from {REPAIR_STRATEGIES}")
+    if halfplanes is None:
+        # Supplied halfplanes mean the caller has resolved the region already; resolving
+        # again would re-run the convexity test on every call
+        polygon = as_region(polygon)
+    points = np.array(points, dtype=float)
+    flat = points.reshape(-1, points.shape[-1])
+
+    if strategy == "resample":
+        from pso_optimizer import fast_is_inside, generate_valid_points
+        outside = ~fast_is_inside(flat, polygon)
+        if np.any(outside):
+            flat[outside] = generate_valid_points(int(np.sum(outside)), polygon)
+        return points
+
+    grid = _nonconvex_index(polygon)
+    if grid:
+        outside = ~polygon.contains(flat)
+    else:
+        halfplanes = halfplanes if halfplanes is not None else polygon_halfplanes(polygon)
+        normals, offsets, hull_vertices = halfplanes
+        outside = ~inside_halfplanes(flat, normals, offsets)
+    if not np.any(outside):
+        return points
+
+    if previous is not None:
+        start = np.asarray(previous, dtype=float).reshape(-1, flat.shape[-1])[outside]
+    elif strategy in ("revert", "reflect"):
+        raise ValueError(f"Repair strategy '{strategy}' needs the previous positions")
+    elif grid:
+        start = None  # the centroid of a non-convex polygon need not be inside it
+    else:
+        start = np.broadcast_to(np.mean(hull_vertices, axis=0), flat[outside].shape)
+
+    if strategy == "revert":
+        flat[outside] = start
+    elif strategy == "clamp":
+        if not grid:
+            flat[outside] = clamp_along_move(start, flat[outside], halfplanes)
+        elif start is not None:
+            flat[outside], _ = polygon.clamp(start, flat[outside])
+        else:
+            flat[outside] = polygon.project(flat[outside])
+    elif strategy == "reflect":
+        reflect = polygon.reflect if grid else lambda a, b: reflect_off_boundary(a, b, halfplanes)
+        flat[outside], _ = reflect(start, flat[outside])
+    elif strategy == "project":
+        flat[outside] = polygon.project(flat[outside]) if grid else project_inside(flat[outside], polygon, halfplanes)
+    return points
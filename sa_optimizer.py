@@ -1,18 +1,24 @@
 import numpy as np
 import random
 from matplotlib.path import Path
+from polytope import as_region, is_region_object, region_bounds, region_dimension, region_extent
+from objectives import get_objective, sum_sq
+from repair import repair, polygon_halfplanes, region_halfplanes
+from checkpoint import run_fingerprint
+from history import FitnessHistory, RunResult, resume_history
+from warm_start import as_population
 
 def calculate_total_distance(points):
-    dist_sum = 0.0
-    for i in range(len(points)):
-        for j in range(i + 1, len(points)):
-            dist_sum += np.sum((points[i] - points[j]) ** 2)  # Squared distance
-    return dist_sum
+    return float(sum_sq(points))
 
 def point_in_polygon(point, polygon):
+    if is_region_object(polygon):
+        return bool(polygon.contains(point))
     return Path(polygon).contains_point(point)
 
 def generate_random_points_in_polygon(polygon, k):
+    if is_region_object(polygon):
+        return polygon.sample(k)
     min_x, min_y = np.min(polygon, axis=0)
     max_x, max_y = np.max(polygon, axis=0)
     points = []
@@ -22,32 +28,338 @@ def generate_random_points_in_polygon(polygon, k):
             points.append(p)
     return np.array(points)
 
-def simulated_annealing(polygon, k, initial_temp=1.0, cooling_rate=0.995, iterations=2000):
-    current_points = generate_random_points_in_polygon(polygon, k)
-    current_fitness = calculate_total_distance(current_points)
-    best_points = current_points.copy()
-    best_fitness = current_fitness
-    fitness_history = [best_fitness]
+# --- Cooling schedules ---
+# Each schedule maps (temperature, iteration) to the next temperature; `state` carries
+# the constants a schedule needs so that the annealing loop itself stays schedule-agnostic.
+def geometric_cooling(temp, iteration, state):
+    return temp * state["cooling_rate"]
+
+def logarithmic_cooling(temp, iteration, state):
+    return state["initial_temp"] / np.log(np.e + iteration + 1)
+
+def lundy_mees_cooling(temp, iteration, state):
+    return temp / (1 + state["beta"] * temp)
+
+def adaptive_cooling(temp, iteration, state):
+    # Steer the acceptance ratio of worsening moves towards a target that decays
+    # log-linearly from target_start to target_end over the run.
+    window = state["window"]
+    if (iteration + 1) % window != 0:
+        return temp
+    proposed = state["worse_proposed"]
+    ratio = state["worse_accepted"] / proposed if proposed else 0.0
+    progress = min(1.0, (iteration + 1) / state["iterations"])
+    target = state["target_start"] * (state["target_end"] / state["target_start"]) ** progress
+    state["worse_proposed"] = 0
+    state["worse_accepted"] = 0
+    return temp * np.exp(state["gain"] * (target - ratio) / max(target, 1e-12))
+
+COOLING_SCHEDULES = {
+    "geometric": geometric_cooling,
+    "logarithmic": logarithmic_cooling,
+    "lundy_mees": lundy_mees_cooling,
+    "adaptive": adaptive_cooling,
+}
+
+def perturb(points, step_size):
+    return points + np.random.normal(0, step_size, points.shape)
+
+def perturb_one(points, step_size):
+    """Move a single random point; returns (index, new position)."""
+    idx = np.random.randint(len(points))
+    return idx, points[idx] + np.random.normal(0, step_size, points.shape[1])
+
+def calibrate_initial_temp(polygon, points, step_size, acceptance=0.8, samples=100,
+                           objective="sum_sq", weights=None, move="all"):
+    """Pick T0 so that an average worsening move is accepted with probability `acceptance`."""
+    evaluate = get_objective(objective).batch
+    fitness = evaluate(points, weights)
+    deltas = []
+    for _ in range(samples):
+        if move == "single":
+            new_points = points.copy()
+            idx, new_point = perturb_one(points, step_size)
+            if point_in_polygon(new_point, polygon):
+                new_points[idx] = new_point
+        else:
+            new_points = perturb(points, step_size)
+            for idx, point in enumerate(new_points):
+                if not point_in_polygon(point, polygon):
+                    new_points[idx] = points[idx]
+        delta = evaluate(new_points, weights) - fitness
+        if delta < 0:
+            deltas.append(-delta)
+    if not deltas:
+        return 1.0
+    return -np.mean(deltas) / np.log(acceptance)
+
+def simulated_annealing(polygon, k, initial_temp=1.0, cooling_rate=0.995, iterations=2000,
+                        schedule="geometric", final_temp=None, step_size=0.01,
+                        target_acceptance=(0.5, 0.01), adapt_window=50, adapt_gain=0.5,
+                        reheat_after=None, reheat_fraction=0.5, callback=None,
+                        checkpoints=None, checkpointer=None, repair_strategy="revert",
+                        objective="sum_sq", weights=None, move="all", initial_points=None, history=None,
+                        halfplanes=None):
+    """Anneal a placement of k points.
+
+    move="all" perturbs every point per iteration; move="single" perturbs one point and
+    scores it with the objective's O(k) delta kernel where it has one. `initial_points`
+    starts the anneal from a given placement (the best of a population). The
+    returned history holds the initial fitness at 0 and the best after iteration i at i + 1,
+    with the current fitness and temperature as extras "current" and "temperature".
+    """
+    if schedule not in COOLING_SCHEDULES:
+        raise ValueError(f"Unknown cooling schedule '{schedule}'. Choose from {list(COOLING_SCHEDULES)}")
+    if move not in ("all", "single"):
+        raise ValueError(f"Unknown move '{move}'. Choose from ('all', 'single')")
+    objective = get_objective(objective)
+
+    polygon = as_region(polygon)
+    if step_size is None:
+        # Scale the move to the polygon: 1% of the bounding-box diagonal
+        step_size = 0.01 * np.linalg.norm(region_extent(polygon))
+
+    if halfplanes is None:
+        halfplanes = region_halfplanes(polygon)
+    checkpoints = set(checkpoints or ())
+    restored = None
+    if checkpointer is not None:
+        restored = checkpointer.restore("SA", run_fingerprint(
+            polygon, k, objective, weights, initial_temp=initial_temp, cooling_rate=cooling_rate,
+            iterations=iterations, schedule=schedule, final_temp=final_temp, step_size=step_size,
+            target_acceptance=target_acceptance, adapt_window=adapt_window, adapt_gain=adapt_gain,
+            reheat_after=reheat_after, reheat_fraction=reheat_fraction, repair_strategy=repair_strategy,
+            move=move, initial_points=initial_points))
+    if restored is not None:
+        current_points, current_fitness = restored["current_points"], restored["current_fitness"]
+        best_points, best_fitness = restored["best_points"], restored["best_fitness"]
+        fitness_history = resume_history(history, restored["fitness_history"])
+        snapshots = restored["snapshots"]
+        initial_temp, final_temp = restored["initial_temp"], restored["final_temp"]
+    else:
+        if initial_points is None:
+            current_points = generate_random_points_in_polygon(polygon, k)
+        else:
+            seeds = as_population(initial_points, k, region_dimension(polygon))
+            current_points = seeds[np.argmax(objective.batch(seeds, weights))].copy()
+        current_fitness = float(objective.batch(current_points, weights))
+        best_points = current_points.copy()
+        best_fitness = current_fitness
+        fitness_history = history if history is not None else FitnessHistory()
+        fitness_history.reserve(iterations + 1)
+        fitness_history.record(0, best_fitness, current=current_fitness)
+        snapshots = {}  # iterations completed -> (best_points, best_fitness)
+
+        if initial_temp is None or initial_temp == "auto":
+            initial_temp = calibrate_initial_temp(polygon, current_points, step_size, target_acceptance[0],
+                                                  objective=objective, weights=weights, move=move)
+        if final_temp is None:
+            final_temp = initial_temp * 1e-3
+
+    schedule_state = {
+        "initial_temp": initial_temp,
+        "cooling_rate": cooling_rate,
+        "iterations": iterations,
+        "beta": (initial_temp - final_temp) / (max(iterations, 1) * initial_temp * final_temp),
+        "target_start": target_acceptance[0],
+        "target_end": target_acceptance[1],
+        "window": adapt_window,
+        "gain": adapt_gain,
+        "worse_proposed": 0,
+        "worse_accepted": 0,
+    }
+    next_temp = COOLING_SCHEDULES[schedule]
 
     temp = initial_temp
+    since_improvement = 0
+    start_iteration = 0
+    if restored is not None:
+        schedule_state.update(restored["schedule_state"])
+        temp, since_improvement = restored["temp"], restored["since_improvement"]
+        start_iteration = restored["next_iteration"]
 
-    for i in range(iterations):
-        new_points = current_points + np.random.normal(0, 0.01, current_points.shape)
-        for idx, point in enumerate(new_points):
-            if not point_in_polygon(point, polygon):
-                new_points[idx] = current_points[idx]
+    def checkpoint_state():
+        return {
+            "optimizer": "SA", "next_iteration": i + 1,
+            "current_points": current_points, "current_fitness": current_fitness,
+            "best_points": best_points, "best_fitness": best_fitness,
+            "fitness_history": fitness_history, "snapshots": snapshots,
+            "initial_temp": initial_temp, "final_temp": final_temp, "temp": temp,
+            "since_improvement": since_improvement, "schedule_state": schedule_state,
+        }
 
-        new_fitness = calculate_total_distance(new_points)
+    for i in range(start_iteration, iterations):
+        if move == "single":
+            idx, new_point = perturb_one(current_points, step_size)
+            if repair_strategy == "revert":
+                if not point_in_polygon(new_point, polygon):
+                    new_point = current_points[idx]
+            else:
+                new_point = repair(new_point[None], polygon, repair_strategy,
+                                   previous=current_points[idx][None], halfplanes=halfplanes)[0]
+            new_points = current_points.copy()
+            new_points[idx] = new_point
+            if objective.delta is not None:
+                new_fitness = current_fitness + objective.delta(current_points, idx, new_point, weights)
+            else:
+                new_fitness = float(objective.batch(new_points, weights))
+        else:
+            new_points = perturb(current_points, step_size)
+            if repair_strategy == "revert":
+                for idx, point in enumerate(new_points):
+                    if not point_in_polygon(point, polygon):
+                        new_points[idx] = current_points[idx]
+            else:
+                new_points = repair(new_points, polygon, repair_strategy, previous=current_points, halfplanes=halfplanes)
+            new_fitness = float(objective.batch(new_points, weights))
 
-        if new_fitness > current_fitness or random.random() < np.exp((new_fitness - current_fitness) / temp):
+        if new_fitness > current_fitness:
+            accept = True
+        else:
+            schedule_state["worse_proposed"] += 1
+            accept = temp > 0 and random.random() < np.exp((new_fitness - current_fitness) / temp)
+            schedule_state["worse_accepted"] += accept
+
+        if accept:
             current_points = new_points
             current_fitness = new_fitness
 
             if new_fitness > best_fitness:
                 best_points = new_points.copy()
                 best_fitness = new_fitness
+                since_improvement = -1
+
+        since_improvement += 1
+        fitness_history.record(i + 1, best_fitness, current=current_fitness, temperature=temp)
+        if i + 1 in checkpoints:
+            snapshots[i + 1] = (best_points.copy(), best_fitness)
+
+        # callback(iteration, best_points, best_fitness) may return True to stop early
+        if callback is not None and callback(i, best_points, best_fitness):
+            break
+
+        temp = next_temp(temp, i, schedule_state)
+
+        # Reheat when the search has stagnated, restarting from the best placement
+        if reheat_after is not None and since_improvement >= reheat_after:
+            temp = max(temp, reheat_fraction * initial_temp)
+            current_points = best_points.copy()
+            current_fitness = best_fitness
+            since_improvement = 0
+
+        if checkpointer is not None:
+            checkpointer.end_iteration(i, iterations, checkpoint_state)
+
+    if move == "single" and objective.delta is not None:
+        best_fitness = float(objective.batch(best_points, weights))  # drop rounding drift from summed deltas
+    return RunResult(best_points, best_fitness, fitness_history, snapshots)
+
+# --- Batched annealing ---
+# Runs B independent annealers at once as (B, k, d) arrays. Each run may use its own
+# convex polygon or polytope, given in half-plane form; facets are padded to a common count with
+# zero normals and infinite offsets so the containment test stays a single einsum.
+def pad_halfplanes(halfplanes):
+    m = max(len(normals) for normals, _, _ in halfplanes)
+    normals = np.zeros((len(halfplanes), m, halfplanes[0][0].shape[1]))
+    offsets = np.full((len(halfplanes), m), np.inf)
+    for b, (n, o, _) in enumerate(halfplanes):
+        normals[b, :len(n)] = n
+        offsets[b, :len(o)] = o
+    return normals, offsets
+
+def _inside_batch(points, normals, offsets):
+    return np.all(np.einsum('bkd,bmd->bkm', points, normals) <= offsets[:, None, :] + 1e-9, axis=-1)
+
+def simulated_annealing_batch(polygons, k, iterations=2000, halfplanes=None, step_fraction=0.01,
+                              initial_acceptance=0.5, final_temp_ratio=1e-3, calibration_samples=20,
+                              callback=None, objective="sum_sq", weights=None, initial_points=None,
+                              seeds=None):
+    """Anneal one placement per convex polygon in lockstep.
+
+    Uses the auto-calibrated geometric schedule, decaying each run's temperature to
+    final_temp_ratio * T0 over `iterations`. `initial_points` holds one (k, d) starting
+    placement per run. With `seeds` (one per run, None for fresh entropy) every run draws
+    from its own generator, so its result does not depend on the other runs in the batch.
+    Returns (best_points, best_fitness) as (B, k, d) and (B,) arrays.
+    """
+    evaluate = get_objective(objective).batch
+    polygons = [as_region(p) for p in polygons]
+    if halfplanes is None:
+        halfplanes = [polygon_halfplanes(p) for p in polygons]
+    normals, offsets = pad_halfplanes(halfplanes)
+    lows, highs = (np.array(b) for b in zip(*(region_bounds(p) for p in polygons)))
+    dim = normals.shape[-1]
+    steps = step_fraction * np.linalg.norm(highs - lows, axis=1)[:, None, None]
+    n_runs = len(polygons)
+    rngs = None if seeds is None else [np.random.default_rng(seed) for seed in seeds]
+
+    def normal(shape):
+        if rngs is None:
+            return np.random.normal(0, 1, shape)
+        return np.stack([rng.normal(0, 1, shape[1:]) for rng in rngs])
+
+    def uniform():
+        if rngs is None:
+            return np.random.rand(n_runs)
+        return np.array([rng.random() for rng in rngs])
+
+    if initial_points is not None:
+        current = as_population(initial_points, k, dim)
+        if len(current) != n_runs:
+            raise ValueError(f"Expected one initial placement per polygon ({n_runs}), got {len(current)}")
+        current = current.copy()
+    elif rngs is not None:
+        # Rejection-sample each run's starting placement from its own generator
+        current = np.empty((n_runs, k, dim))
+        for b, rng in enumerate(rngs):
+            for j in range(k):
+                point = rng.uniform(lows[b], highs[b])
+                while not _inside_batch(point[None, None], normals[b:b + 1], offsets[b:b + 1])[0, 0]:
+                    point = rng.uniform(lows[b], highs[b])
+                current[b, j] = point
+    elif any(is_region_object(p) for p in polygons):
+        # Bounding-box rejection degrades quickly with d; use each polytope's own sampler
+        current = np.stack([generate_random_points_in_polygon(p, k) for p in polygons])
+    else:
+        # Rejection-sample the starting placements for every run at once
+        current = np.random.uniform(lows[:, None, :], highs[:, None, :], (n_runs, k, dim))
+        pending = ~_inside_batch(current, normals, offsets)
+        while np.any(pending):
+            fresh = np.random.uniform(lows[:, None, :], highs[:, None, :], (n_runs, k, dim))
+            current = np.where(pending[..., None], fresh, current)
+            pending = ~_inside_batch(current, normals, offsets)
+    current_fitness = evaluate(current, weights)
+
+    def propose(points):
+        moved = points + normal(points.shape) * steps
+        inside = _inside_batch(moved, normals, offsets)
+        return np.where(inside[..., None], moved, points)
+
+    # Per-run T0 from the mean worsening delta of a few sampled moves
+    deltas = np.stack([evaluate(propose(current), weights) - current_fitness for _ in range(calibration_samples)])
+    n_worse = np.sum(deltas < 0, axis=0)
+    total_worse = np.sum(np.where(deltas < 0, -deltas, 0.0), axis=0)
+    mean_worse = np.where(n_worse > 0, total_worse / np.maximum(n_worse, 1), 1.0)
+    temp = -mean_worse / np.log(initial_acceptance)
+    cooling_rate = final_temp_ratio ** (1.0 / max(iterations, 1))
+
+    best = current.copy()
+    best_fitness = current_fitness.copy()
+    for i in range(iterations):
+        candidate = propose(current)
+        candidate_fitness = evaluate(candidate, weights)
+        delta = candidate_fitness - current_fitness
+        with np.errstate(over='ignore', divide='ignore'):
+            accept = (delta > 0) | (uniform() < np.exp(delta / temp))
+        current = np.where(accept[:, None, None], candidate, current)
+        current_fitness = np.where(accept, candidate_fitness, current_fitness)
+        improved = current_fitness > best_fitness
+        best[improved] = current[improved]
+        best_fitness[improved] = current_fitness[improved]
+        temp = temp * cooling_rate
 
-        fitness_history.append(best_fitness)
-        temp *= cooling_rate
+        # callback(iteration, best, best_fitness) sees all runs; return True to stop early
+        if callback is not None and callback(i, best, best_fitness):
+            break
 
-    return best_points, best_fitness, fitness_history
+    return best, best_fitness
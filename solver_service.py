@@ -0,0 +1,337 @@
+import hashlib
+import json
+import os
+import random
+import socketserver
+import threading
+import time
+import urllib.request
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from scipy.spatial import QhullError
+
+# --- Local solver daemon ---
+# A long-lived process that answers JSON solve requests over local HTTP (TCP or a Unix
+# socket). Solves run in a pre-warmed process pool. SA requests without params on a convex
+# polygon always run simulated_annealing_batch, each with a generator seeded from its own
+# request, so a request gives the same result whether it shares a batch or runs alone;
+# those that arrive close together are micro-batched into one call.
+#
+#   POST /solve  {"polygon": [[x, y, ...], ...], "k": 4, "optimizer": "SA", "iterations": 2000,
+#                 "params": {...}, "seed": 0}
+#   GET  /stats  request, batch and latency counters
+#
+# "params" override portfolio.DEFAULT_SLICE_PARAMS for the chosen optimizer. The budget
+# comes from "iterations", and the arguments run_slice sets itself may not be overridden.
+
+OPTIMIZERS = ("GA", "PSO", "ACO", "SA")
+REGION_CACHE_SIZE = 256
+RESERVED_PARAMS = ("callback", "initial_points", "halfplanes", "verbose", "test_points", "polygon", "k")
+
+
+# --- Per-polygon precomputation, cached in every process ---
+_region_cache = OrderedDict()
+_region_lock = threading.Lock()  # handler threads share the cache
+
+def region_key(polygon):
+    return hashlib.sha1(np.ascontiguousarray(polygon, dtype=float).tobytes()).hexdigest()
+
+def prepare_region(polygon, key=None):
+    from convexpolygon import is_convex
+    from polytope import as_region
+    from repair import region_halfplanes
+
+    key = key or region_key(polygon)
+    with _region_lock:
+        region = _region_cache.get(key)
+        if region is not None:
+            _region_cache.move_to_end(key)
+            return region
+    # Built outside the lock; two threads racing on a new polygon both build it, harmlessly
+    # Vertex sets in three or more dimensions are solved over their convex hull
+    region = as_region(polygon)
+    region = {
+        "polygon": region,
+        "dim": polygon.shape[1],
+        "convex": is_convex(polygon) if polygon.shape[1] == 2 else True,
+        "halfplanes": region_halfplanes(region),
+    }
+    with _region_lock:
+        _region_cache[key] = region
+        if len(_region_cache) > REGION_CACHE_SIZE:
+            _region_cache.popitem(last=False)
+    return region
+
+
+# --- Worker-side entry points ---
+def _warm_worker():
+    # Pay the numpy/scipy/matplotlib import cost once per worker, not per request
+    import optimization, pso_optimizer, aco_optimizer, sa_optimizer, portfolio  # noqa: F401
+
+def _ping():
+    return os.getpid()
+
+def _solve_one(request):
+    from portfolio import DEFAULT_SLICE_PARAMS, run_slice
+    from tuner import BUDGET_PARAM
+
+    if request.get("seed") is not None:
+        np.random.seed(request["seed"])
+        random.seed(request["seed"])
+    region = prepare_region(np.asarray(request["polygon"], dtype=float), request["region_key"])
+    optimizer = request["optimizer"]
+    params = dict(DEFAULT_SLICE_PARAMS[optimizer], **request["params"])
+    params[BUDGET_PARAM[optimizer]] = request["iterations"]
+    points, fitness = run_slice(optimizer, region["polygon"], request["k"], params, callback=None,
+                                halfplanes=region["halfplanes"])
+    return np.asarray(points).tolist(), float(fitness)
+
+def _solve_batch(requests):
+    from sa_optimizer import simulated_annealing_batch
+
+    polygons = [np.asarray(r["polygon"], dtype=float) for r in requests]
+    halfplanes = [prepare_region(p, r["region_key"])["halfplanes"] for p, r in zip(polygons, requests)]
+    best, fitness = simulated_annealing_batch(polygons, requests[0]["k"], requests[0]["iterations"],
+                                              halfplanes=halfplanes, seeds=[r.get("seed") for r in requests])
+    return [(points.tolist(), float(f)) for points, f in zip(best, fitness)]
+
+
+class SolverService:
+    """Warm process pool plus a micro-batcher for small SA requests."""
+
+    def __init__(self, workers=None, batch_window=0.005, max_batch=64, batch_max_iterations=5000):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batch_max_iterations = batch_max_iterations
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_warm_worker)
+        for f in [self.pool.submit(_ping) for _ in range(self.workers)]:
+            f.result()
+
+        self.pending = {}  # (k, iterations) -> [(request, future), ...]
+        self.pending_lock = threading.Condition()
+        self.running = True
+        self.started = time.time()
+        self.counters = {"requests": 0, "completed": 0, "errors": 0, "batches": 0, "batched_requests": 0}
+        self.latencies = deque(maxlen=10000)
+        self.stats_lock = threading.Lock()
+        self.batcher = threading.Thread(target=self._batch_loop, daemon=True)
+        self.batcher.start()
+
+    def validate(self, payload):
+        from tuner import BUDGET_PARAM
+
+        polygon = np.asarray(payload["polygon"], dtype=float)
+        if polygon.ndim != 2 or polygon.shape[1] < 2 or len(polygon) <= polygon.shape[1]:
+            raise ValueError("polygon must be a list of at least d + 1 vertices [x, y, ...] with d >= 2")
+        k = int(payload["k"])
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        optimizer = payload.get("optimizer", "SA").upper()
+        if optimizer not in OPTIMIZERS:
+            raise ValueError(f"optimizer must be one of {OPTIMIZERS}")
+        params = payload.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+        if BUDGET_PARAM[optimizer] in params:
+            raise ValueError(f"set the budget with \"iterations\", not params[\"{BUDGET_PARAM[optimizer]}\"]")
+        reserved = sorted(set(params) & set(RESERVED_PARAMS))
+        if reserved:
+            raise ValueError(f"params may not set {reserved}; the service sets them itself")
+        request = {
+            "polygon": polygon.tolist(), "k": k, "optimizer": optimizer,
+            "iterations": int(payload.get("iterations", 2000)),
+            "params": params, "seed": payload.get("seed"),
+            "region_key": region_key(polygon),
+        }
+        try:
+            region = prepare_region(polygon, request["region_key"])
+        except QhullError as exc:
+            raise ValueError(f"degenerate polygon: {str(exc).splitlines()[0]}") from None
+        return request, region
+
+    def submit(self, payload):
+        """Queue a solve and return a Future resolving to (points, fitness)."""
+        with self.stats_lock:
+            self.counters["requests"] += 1
+        request, region = self.validate(payload)
+        batchable = (request["optimizer"] == "SA" and not request["params"] and region["convex"]
+                     and region["dim"] == 2)
+        if not batchable:
+            return self.pool.submit(_solve_one, request)
+        future = Future()
+        if request["iterations"] > self.batch_max_iterations:
+            # Long runs go alone, through the same annealer, so they don't hold up a batch
+            self._dispatch([(request, future)])
+            return future
+        with self.pending_lock:
+            if not self.running:
+                raise RuntimeError("Solver service is closed")
+            self.pending.setdefault((request["k"], request["iterations"]), []).append((request, future))
+            self.pending_lock.notify()
+        return future
+
+    def _batch_loop(self):
+        # Runs until close(), then dispatches whatever is still pending before exiting
+        while True:
+            with self.pending_lock:
+                while self.running and not self.pending:
+                    self.pending_lock.wait()
+                if not self.pending:
+                    return
+            if self.running:
+                time.sleep(self.batch_window)  # let concurrent requests pile up
+            with self.pending_lock:
+                groups, self.pending = self.pending, {}
+            for entries in groups.values():
+                for start in range(0, len(entries), self.max_batch):
+                    self._dispatch(entries[start:start + self.max_batch])
+
+    def _dispatch(self, entries):
+        requests = [r for r, _ in entries]
+        task = self.pool.submit(_solve_batch, requests)
+        with self.stats_lock:
+            self.counters["batches"] += 1
+            self.counters["batched_requests"] += len(entries)
+
+        def done(task):
+            try:
+                results = task.result()
+                for (_, future), result in zip(entries, results):
+                    future.set_result(result)
+            except Exception as exc:
+                for _, future in entries:
+                    future.set_exception(exc)
+        task.add_done_callback(done)
+
+    def solve(self, payload):
+        start = time.time()
+        try:
+            points, fitness = self.submit(payload).result()
+        except Exception:
+            with self.stats_lock:
+                self.counters["errors"] += 1
+            raise
+        latency = time.time() - start
+        with self.stats_lock:
+            self.counters["completed"] += 1
+            self.latencies.append(latency)
+        return {"points": points, "fitness": fitness, "latency": latency}
+
+    def stats(self):
+        with self.stats_lock:
+            latencies = np.array(self.latencies)
+            uptime = time.time() - self.started
+            report = dict(self.counters)
+        report.update({
+            "uptime": uptime,
+            "throughput": report["completed"] / uptime if uptime > 0 else 0.0,
+            "latency_mean": float(latencies.mean()) if len(latencies) else None,
+            "latency_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "latency_p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+            "workers": self.workers,
+            "cached_regions": len(_region_cache),
+        })
+        return report
+
+    def close(self):
+        """Stop accepting requests, finish the queued ones, then shut the pool down."""
+        with self.pending_lock:
+            self.running = False
+            self.pending_lock.notify()
+        self.batcher.join()
+        with self.pending_lock:
+            groups, self.pending = self.pending, {}
+        for entries in groups.values():  # queued after the batcher exited
+            for _, future in entries:
+                future.set_exception(RuntimeError("Solver service is closed"))
+        self.pool.shutdown()
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._reply(200, self.service.stats())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/solve":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            self._reply(200, self.service.solve(payload))
+        except (KeyError, ValueError, TypeError) as exc:
+            self._reply(400, {"error": str(exc)})
+        except Exception as exc:
+            self._reply(500, {"error": str(exc)})
+
+    def address_string(self):
+        # Unix-socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(service, host="127.0.0.1", port=8765, socket_path=None):
+    handler = type("BoundSolverRequestHandler", (SolverRequestHandler,), {"service": service})
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return ThreadingUnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def solve_remote(payload, url="http://127.0.0.1:8765"):
+    request = urllib.request.Request(f"{url}/solve", data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def serve(host="127.0.0.1", port=8765, socket_path=None, workers=None):
+    service = SolverService(workers=workers)
+    server = make_server(service, host, port, socket_path)
+    where = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(f"Solver service listening on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local k-furthest-neighbour solver service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", default=None, help="serve on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.socket, args.workers)
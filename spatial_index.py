@@ -0,0 +1,279 @@
+import numpy as np
+from matplotlib.path import Path
+from scipy.spatial import ConvexHull
+
+# --- Grid-bucketed spatial index for polygon containment ---
+# The polygon's bounding box is cut into a uniform grid. Each cell stores the edges that
+# pass through it (CSR layout) and a status: fully inside, fully outside, or boundary.
+# Boundary cells also keep an anchor point with a known inside/outside answer, so a query
+# point only needs the parity of crossings between the anchor and itself against the few
+# edges of its own cell. Works for convex and non-convex (simple) polygons alike.
+
+OUTSIDE, INSIDE, BOUNDARY = 0, 1, 2
+INDEX_MIN_VERTICES = 256  # as_region() indexes convex polygons from this many vertices up
+
+# Anchor position within a boundary cell; off-centre so it does not sit on axis-aligned edges
+_ANCHOR = np.array([0.5 + 0.0417, 0.5 - 0.0273])
+
+
+def needs_index(polygon):
+    from convexpolygon import is_convex
+    return len(polygon) >= INDEX_MIN_VERTICES or not is_convex(polygon)
+
+def _cross(u, v):
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+def _gather_ranges(offsets, keys):
+    """Concatenated CSR ranges for `keys`; returns (row of each entry, flat positions)."""
+    counts = offsets[keys + 1] - offsets[keys]
+    rows = np.repeat(np.arange(len(keys)), counts)
+    within = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, np.repeat(offsets[keys], counts) + within
+
+
+class GridIndex:
+    """Containment, sampling and boundary repair for a 2-D polygon in near O(1) per point."""
+
+    def __init__(self, polygon, cells_per_edge=2.0, max_cells=1 << 20):
+        from convexpolygon import is_convex
+
+        self.vertices = np.asarray(polygon, dtype=float)
+        self.dim = 2
+        self.lower = np.min(self.vertices, axis=0)
+        self.upper = np.max(self.vertices, axis=0)
+        self.convex = is_convex(self.vertices)
+        self.starts = self.vertices
+        self.ends = np.roll(self.vertices, -1, axis=0)
+        # Outward normal of each edge: (dy, -dx) for a counter-clockwise ring
+        edges = self.ends - self.starts
+        orientation = np.sign(np.sum(_cross(self.starts, self.ends))) or 1.0
+        normals = orientation * np.column_stack((edges[:, 1], -edges[:, 0]))
+        self.edge_normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+        # Outward bisector at each vertex, so that sharp corners can be nudged inward too
+        bisectors = self.edge_normals + np.roll(self.edge_normals, 1, axis=0)
+        self.vertex_normals = bisectors / np.maximum(np.linalg.norm(bisectors, axis=1, keepdims=True), 1e-300)
+        self._halfplanes = None
+
+        extent = np.maximum(self.upper - self.lower, 1e-12)
+        n_cells = int(np.clip(cells_per_edge * len(self.vertices), 16, max_cells))
+        nx = max(1, int(round(np.sqrt(n_cells * extent[0] / extent[1]))))
+        ny = max(1, int(round(n_cells / nx)))
+        self.shape = np.array([nx, ny])
+        self.cell_size = extent / self.shape
+
+        cells, edge_ids = self._edge_cells()
+        order = np.lexsort((edge_ids, cells))
+        self.cell_offsets = np.searchsorted(cells[order], np.arange(nx * ny + 1))
+        self.cell_edges = edge_ids[order]
+
+        ij = np.stack(np.unravel_index(np.arange(nx * ny), (nx, ny)), axis=1)
+        self.anchors = self.lower + (ij + _ANCHOR) * self.cell_size
+        self.anchor_inside = Path(self.vertices).contains_points(self.anchors)
+        has_edges = np.diff(self.cell_offsets) > 0
+        self.status = np.where(has_edges, BOUNDARY, np.where(self.anchor_inside, INSIDE, OUTSIDE)).astype(np.int8)
+
+    def _edge_cells(self):
+        """(cell, edge) pairs for every cell an edge passes through."""
+        lo = self.cell_of(np.minimum(self.starts, self.ends))
+        hi = self.cell_of(np.maximum(self.starts, self.ends))
+        spans = hi - lo + 1
+        counts = spans[:, 0] * spans[:, 1]
+        edge_ids = np.repeat(np.arange(len(self.starts)), counts)
+        k = np.arange(len(edge_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+        i = lo[edge_ids, 0] + k // spans[edge_ids, 1]
+        j = lo[edge_ids, 1] + k % spans[edge_ids, 1]
+
+        # Keep bounding-box cells whose corners are not all on one side of the edge's line
+        a, e = self.starts[edge_ids], self.ends[edge_ids] - self.starts[edge_ids]
+        corner = self.lower + np.stack((i, j), axis=1) * self.cell_size
+        sides = np.stack([_cross(e, corner + offset * self.cell_size - a)
+                          for offset in ([0, 0], [1, 0], [0, 1], [1, 1])], axis=1)
+        tol = 1e-12 * np.linalg.norm(e, axis=1) * np.max(self.cell_size)
+        keep = (np.min(sides, axis=1) <= tol) & (np.max(sides, axis=1) >= -tol)
+        return i[keep] * self.shape[1] + j[keep], edge_ids[keep]
+
+    def cell_of(self, points):
+        ij = np.floor((points - self.lower) / self.cell_size).astype(np.int64)
+        return np.clip(ij, 0, self.shape - 1)
+
+    def cell_id(self, points):
+        ij = self.cell_of(points)
+        return ij[..., 0] * self.shape[1] + ij[..., 1]
+
+    @property
+    def halfplanes(self):
+        """(normals, offsets, hull vertices) when the polygon is convex."""
+        if not self.convex:
+            raise ValueError("Half-plane form is only defined for convex polygons")
+        if self._halfplanes is None:
+            hull = ConvexHull(self.vertices)
+            self._halfplanes = (hull.equations[:, :-1], -hull.equations[:, -1], self.vertices[hull.vertices])
+        return self._halfplanes
+
+    def contains(self, points):
+        points = np.asarray(points, dtype=float)
+        flat = points.reshape(-1, 2)
+        ij = np.floor((flat - self.lower) / self.cell_size).astype(np.int64)
+        in_box = np.all((ij >= 0) & (ij < self.shape), axis=1)
+        cells = np.where(in_box, ij[:, 0] * self.shape[1] + ij[:, 1], 0)
+        status = np.where(in_box, self.status[cells], OUTSIDE)
+        inside = status == INSIDE
+        boundary = np.flatnonzero(status == BOUNDARY)
+        if len(boundary):
+            inside[boundary] = self._parity_inside(flat[boundary], cells[boundary])
+        return inside.reshape(points.shape[:-1])
+
+    def _parity_inside(self, points, cells):
+        # Segment anchor -> point stays within the (convex) cell, so only the cell's edges can cross it
+        rows, flat = _gather_ranges(self.cell_offsets, cells)
+        edges = self.cell_edges[flat]
+        anchor = self.anchors[cells][rows]
+        d = points[rows] - anchor
+        a = self.starts[edges]
+        e = self.ends[edges] - a
+        w = a - anchor
+        denom = _cross(d, e)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = _cross(w, e) / denom
+            t = _cross(w, d) / denom
+        crossing = (denom != 0) & (s >= 0) & (s <= 1) & (t >= 0) & (t < 1)
+        parity = np.bincount(rows, weights=crossing, minlength=len(points)).astype(np.int64) % 2
+        return self.anchor_inside[cells] ^ parity.astype(bool)
+
+    def sample(self, n):
+        """Uniform points: pick non-outside cells uniformly, then reject within boundary cells."""
+        if n == 0:
+            return np.empty((0, 2))
+        candidates = np.flatnonzero(self.status != OUTSIDE)
+        points = []
+        found = 0
+        while found < n:
+            cells = np.random.choice(candidates, 2 * (n - found) + 8)
+            ij = np.stack(np.unravel_index(cells, tuple(self.shape)), axis=1)
+            batch = self.lower + (ij + np.random.rand(len(cells), 2)) * self.cell_size
+            batch = batch[self.contains(batch)]
+            points.append(batch)
+            found += len(batch)
+        return np.vstack(points)[:n]
+
+    # --- Boundary repair for non-convex polygons ---
+    def first_crossing(self, start, end):
+        """Fraction of each move start -> end before it first crosses an edge, and that edge.
+
+        Moves that cross nothing get (1.0, -1). Only edges in the cells covered by a
+        move's bounding box are tested.
+        """
+        lo = self.cell_of(np.minimum(start, end))
+        spans = self.cell_of(np.maximum(start, end)) - lo + 1
+        counts = spans[:, 0] * spans[:, 1]
+        moves = np.repeat(np.arange(len(start)), counts)
+        k = np.arange(len(moves)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells = (lo[moves, 0] + k // spans[moves, 1]) * self.shape[1] + lo[moves, 1] + k % spans[moves, 1]
+        rows, flat = _gather_ranges(self.cell_offsets, cells)
+        moves, edges = moves[rows], self.cell_edges[flat]
+
+        d = end[moves] - start[moves]
+        a = self.starts[edges]
+        e = self.ends[edges] - a
+        w = a - start[moves]
+        denom = _cross(d, e)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = _cross(w, e) / denom
+            t = _cross(w, d) / denom
+        hit = (denom != 0) & (s >= 0) & (s <= 1) & (t >= 0) & (t <= 1)
+        moves, edges, s = moves[hit], edges[hit], s[hit]
+
+        t_hit = np.ones(len(start))
+        edge_hit = np.full(len(start), -1)
+        order = np.lexsort((s, moves))
+        first = order[np.r_[True, moves[order][1:] != moves[order][:-1]]] if len(order) else order
+        t_hit[moves[first]] = s[first]
+        edge_hit[moves[first]] = edges[first]
+        return t_hit, edge_hit
+
+    def clamp(self, start, end, t_hit=None):
+        """Stop each move (start inside) just before it first leaves the polygon."""
+        if t_hit is None:
+            t_hit, _ = self.first_crossing(start, end)
+        move = end - start
+        # Back off a tiny absolute margin so the result is inside, not on the edge
+        margin = 1e-9 * np.linalg.norm(self.upper - self.lower) / np.maximum(np.linalg.norm(move, axis=1), 1e-300)
+        clamped = start + np.maximum(t_hit - margin, 0.0)[:, None] * move
+        # A crossing found right at the start (or lost to rounding) falls back to the start
+        outside = ~self.contains(clamped)
+        clamped[outside] = start[outside]
+        return clamped, t_hit
+
+    def reflect(self, start, end):
+        """Bounce each move off the first edge it crosses; returns (points, normals)."""
+        t_hit, edges = self.first_crossing(start, end)
+        hit, _ = self.clamp(start, end, t_hit)
+        missed = edges < 0
+        if np.any(missed):
+            _, edges[missed] = self.nearest_edge(hit[missed])
+        n = self.edge_normals[edges]
+        move = end - start
+        mirrored = move - 2 * np.sum(move * n, axis=1)[:, None] * n
+        bounced = hit + (1 - t_hit)[:, None] * mirrored
+        outside = ~self.contains(bounced)
+        if np.any(outside):
+            bounced[outside], _ = self.clamp(hit[outside], bounced[outside])
+        return bounced, n
+
+    def nearest_edge(self, points):
+        """Nearest boundary point and its edge, searching the 3x3 cell neighbourhood first."""
+        ij = self.cell_of(points)
+        neighbours = ij[:, None, :] + np.array([[di, dj] for di in (-1, 0, 1) for dj in (-1, 0, 1)])
+        valid = np.all((neighbours >= 0) & (neighbours < self.shape), axis=-1)
+        cells = np.where(valid, neighbours[..., 0] * self.shape[1] + neighbours[..., 1], -1)
+        rows, flat = _gather_ranges(self.cell_offsets, np.where(valid, cells, 0).ravel())
+        keep = valid.ravel()[rows]
+        rows, edges = rows[keep] // 9, self.cell_edges[flat[keep]]
+
+        nearest = np.empty_like(points)
+        best_edge = np.zeros(len(points), dtype=np.int64)
+        best_dist = np.full(len(points), np.inf)
+        if len(rows):
+            q, dist = self._point_segment(points[rows], edges)
+            order = np.lexsort((dist, rows))
+            first = order[np.r_[True, rows[order][1:] != rows[order][:-1]]]
+            best_dist[rows[first]] = dist[first]
+            nearest[rows[first]] = q[first]
+            best_edge[rows[first]] = edges[first]
+
+        # Anything within one cell of the point is in the neighbourhood; otherwise search all edges
+        far = best_dist > np.min(self.cell_size) ** 2
+        if np.any(far):
+            for idx in np.flatnonzero(far):
+                q, dist = self._point_segment(np.broadcast_to(points[idx], self.starts.shape),
+                                              np.arange(len(self.starts)))
+                best = np.argmin(dist)
+                nearest[idx], best_edge[idx] = q[best], best
+        return nearest, best_edge
+
+    def _point_segment(self, points, edges):
+        a = self.starts[edges]
+        e = self.ends[edges] - a
+        t = np.clip(np.sum((points - a) * e, axis=1) / np.sum(e * e, axis=1), 0.0, 1.0)
+        q = np.where((t == 1)[:, None], self.ends[edges], a + t[:, None] * e)
+        return q, np.sum((points - q) ** 2, axis=1)
+
+    def project(self, points):
+        """Nearest boundary point, nudged inward until it tests as inside."""
+        nearest, edges = self.nearest_edge(points)
+        step = 1e-9 * np.max(self.upper - self.lower)
+        inward = -self.edge_normals[edges]
+        # At a vertex, move along the corner's bisector rather than one edge's normal
+        for vertex in (edges, (edges + 1) % len(self.vertices)):
+            at_vertex = np.all(nearest == self.vertices[vertex], axis=1)
+            inward[at_vertex] = -self.vertex_normals[vertex[at_vertex]]
+        result = nearest.copy()
+        outside = np.ones(len(points), dtype=bool)
+        for _ in range(8):
+            result[outside] = nearest[outside] + step * inward[outside]
+            outside[outside] = ~self.contains(result[outside])
+            if not np.any(outside):
+                return result
+            step *= 10
+        result[outside] = self.sample(int(np.sum(outside)))
+        return result
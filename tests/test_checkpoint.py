@@ -0,0 +1,82 @@
+import random
+import numpy as np
+import pytest
+from aco_optimizer import ant_colony_optimization
+from checkpoint import Checkpointer
+from history import FitnessHistory
+from io_operations import generate_regular_polygon
+from optimization import genetic_algorithm
+from pso_optimizer import particle_swarm_optimization
+from sa_optimizer import simulated_annealing
+
+POLYGON = generate_regular_polygon(6, 2.0)
+ITERATIONS = 40
+
+RUNS = {
+    "PSO": lambda k=4, **kw: particle_swarm_optimization(POLYGON, k, 10, ITERATIONS, verbose=False, **kw),
+    "GA": lambda k=4, **kw: genetic_algorithm(POLYGON, POLYGON[:k] * 0.5, 10, ITERATIONS, 0.1, 0.8, **kw),
+    "ACO": lambda k=4, **kw: ant_colony_optimization(POLYGON, k, 5, ITERATIONS, verbose=False, **kw),
+    "SA": lambda k=4, **kw: simulated_annealing(POLYGON, k, iterations=ITERATIONS, **kw),
+}
+
+
+def seeded(run, **kwargs):
+    np.random.seed(3)
+    random.seed(3)
+    return run(**kwargs)
+
+
+@pytest.mark.parametrize("name", sorted(RUNS))
+def test_resume_is_bit_identical(name, tmp_path):
+    run = RUNS[name]
+    filename = str(tmp_path / "run.pkl")
+    points, fitness, history = seeded(run)
+
+    # Interrupted by the callback after 25 iterations; the checkpoint after 20 stays behind
+    seeded(run, callback=lambda i, p, f: i == 24, checkpointer=Checkpointer(filename, every=10))
+    assert (tmp_path / "run.pkl").exists()
+
+    # Resuming reseeds from the checkpoint, whatever the global generators hold now
+    np.random.seed(99)
+    random.seed(99)
+    caller_history = FitnessHistory()
+    resumed = run(checkpointer=Checkpointer(filename, every=10), history=caller_history)
+    np.testing.assert_array_equal(resumed.points, points)
+    assert resumed.fitness == fitness
+    np.testing.assert_array_equal(np.asarray(resumed.history), np.asarray(history))
+    np.testing.assert_array_equal(resumed.history.iterations, history.iterations)
+    assert resumed.history is caller_history
+    # A completed run removes its checkpoint
+    assert not (tmp_path / "run.pkl").exists()
+
+
+def test_checkpoint_of_another_run_is_rejected(tmp_path):
+    filename = str(tmp_path / "run.pkl")
+    seeded(RUNS["PSO"], callback=lambda i, p, f: i == 24, checkpointer=Checkpointer(filename, every=10))
+    with pytest.raises(ValueError):
+        RUNS["PSO"](k=5, checkpointer=Checkpointer(filename, every=10))
+    with pytest.raises(ValueError):
+        RUNS["SA"](checkpointer=Checkpointer(filename, every=10))
+
+
+def test_resume_disabled_starts_over(tmp_path):
+    filename = str(tmp_path / "run.pkl")
+    seeded(RUNS["SA"], callback=lambda i, p, f: i == 24, checkpointer=Checkpointer(filename, every=10))
+    fresh = seeded(RUNS["SA"])
+    restarted = seeded(RUNS["SA"], checkpointer=Checkpointer(filename, every=10, resume=False))
+    assert restarted.fitness == fresh.fitness
+
+
+def test_rejected_checkpoint_leaves_the_generators_alone(tmp_path):
+    filename = str(tmp_path / "run.pkl")
+    seeded(RUNS["PSO"], callback=lambda i, p, f: i == 24, checkpointer=Checkpointer(filename, every=10))
+    for run in (lambda: RUNS["SA"](checkpointer=Checkpointer(filename, every=10)),
+                lambda: RUNS["PSO"](k=5, checkpointer=Checkpointer(filename, every=10))):
+        np.random.seed(7)
+        random.seed(7)
+        with pytest.raises(ValueError):
+            run()
+        state = np.random.get_state()[1]
+        np.random.seed(7)
+        np.testing.assert_array_equal(state, np.random.get_state()[1])
+        assert random.random() == random.Random(7).random()
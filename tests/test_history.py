@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from history import FitnessHistory, RunResult
+
+
+def recorded(mode, values, **kwargs):
+    history = FitnessHistory(mode, **kwargs)
+    for iteration, value in enumerate(values):
+        history.record(iteration, value)
+    return history
+
+
+def test_every_mode_is_a_list_of_values():
+    values = [1.0, 2.0, 2.0, 3.0, 5.0]
+    history = recorded("every", values)
+    assert list(history) == values
+    assert len(history) == 5 and history[-1] == 5.0
+    np.testing.assert_array_equal(history.iterations, np.arange(5))
+
+
+def test_at_returns_latest_value_at_or_before():
+    # Improvement mode stores iterations 0, 2, 4 and 6; the final value is kept as a tail
+    history = recorded("improvement", [1.0, 1.0, 2.0, 2.0, 3.0, 3.0, 4.0, 4.0])
+    np.testing.assert_array_equal(history.iterations, [0, 2, 4, 6, 7])
+    assert [history.at(i) for i in range(8)] == [1.0, 1.0, 2.0, 2.0, 3.0, 3.0, 4.0, 4.0]
+    assert history.at(100) == 4.0
+    with pytest.raises(IndexError):
+        history.at(-1)
+
+
+def test_up_to_cuts_at_a_budget():
+    history = recorded("improvement", [1.0, 1.0, 2.0, 2.0, 3.0, 3.0, 4.0, 4.0])
+    cut = history.up_to(4)  # iterations 0..3
+    np.testing.assert_array_equal(cut.iterations, [0, 2, 3])
+    np.testing.assert_array_equal(cut.values, [1.0, 2.0, 2.0])
+    assert cut.at(3) == history.at(3)
+    # The original is unchanged, and a budget past the end keeps everything
+    assert len(history) == 5
+    np.testing.assert_array_equal(history.up_to(100).values, history.values)
+
+
+def test_up_to_matches_a_shorter_run():
+    rng = np.random.default_rng(0)
+    values = np.maximum.accumulate(rng.normal(size=500))
+    full = recorded("every", values)
+    for budget in (1, 10, 250, 500):
+        np.testing.assert_array_equal(full.up_to(budget).values, recorded("every", values[:budget]).values)
+
+
+@pytest.mark.parametrize("mode", ["every", "log", "improvement"])
+def test_max_points_bounds_storage(mode):
+    values = np.arange(100000, dtype=float)
+    history = recorded(mode, values, max_points=64)
+    assert len(history) <= 64 + 1
+    assert history[-1] == values[-1] and history.iterations[-1] == len(values) - 1
+    assert np.all(np.diff(history.iterations) > 0)
+    # Downsampled points still sit at their own iterations
+    np.testing.assert_array_equal(history.values, history.iterations)
+    for iteration in (0, 777, 54321, 99999):
+        assert history.at(iteration) <= iteration
+
+
+def test_log_mode_keeps_a_log_spread_after_downsampling():
+    # Downsampling widens the log spacing instead of imposing a stride, so the early
+    # decades keep their points
+    history = recorded("log", np.arange(100000, dtype=float), max_points=64)
+    decades = np.floor(np.log10(np.maximum(history.iterations, 1)))
+    assert set(decades) == {0, 1, 2, 3, 4}
+    assert len(history) > 32
+
+
+def test_run_result_trims_the_history():
+    history = recorded("improvement", [1.0, 2.0, 3.0], capacity=256)
+    result = RunResult(np.zeros((2, 2)), 3.0, history)
+    points, fitness, returned = result
+    assert returned is history and len(history._values) == 3
+    assert result.snapshots == {}
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from io_operations import load_instances, save_instances
+
+SQUARE = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+TRIANGLE = np.array([[0.0, 0.0], [2.0, 0.0], [1.0, 3.0]])
+POINTS = np.array([[0.5, 0.5], [0.25, 0.75]])
+
+
+def write_csv(path, rows, header=None):
+    lines = ([header] if header else []) + [",".join(str(v) for v in row) for row in rows]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def instance_rows():
+    # Instances interleaved and out of id order; each keeps its own row order
+    triangle = [(7, *v, 0) for v in TRIANGLE]
+    square = [(3, *v, 0) for v in SQUARE] + [(3, *p, 1) for p in POINTS]
+    return [row for pair in zip(square, triangle) for row in pair] + square[len(triangle):]
+
+
+@pytest.mark.parametrize("header", [None, "instance_id,x,y,role"])
+def test_csv_with_roles(tmp_path, header):
+    loaded = list(load_instances(write_csv(tmp_path / "instances.csv", instance_rows(), header)))
+    assert [i for i, _, _ in loaded] == [3, 7]
+    (_, square, points), (_, triangle, no_points) = loaded
+    np.testing.assert_array_equal(square, SQUARE)
+    np.testing.assert_array_equal(points, POINTS)
+    np.testing.assert_array_equal(triangle, TRIANGLE)
+    assert no_points is None
+
+
+@pytest.mark.parametrize("header", [None, "instance_id,x,y"])
+def test_csv_without_role_column(tmp_path, header):
+    rows = [(1, *v) for v in SQUARE] + [(2, *v) for v in TRIANGLE]
+    loaded = list(load_instances(write_csv(tmp_path / "instances.csv", rows, header)))
+    assert [i for i, _, _ in loaded] == [1, 2]
+    np.testing.assert_array_equal(loaded[0][1], SQUARE)
+    np.testing.assert_array_equal(loaded[1][1], TRIANGLE)
+    assert loaded[0][2] is None and loaded[1][2] is None
+
+
+def test_csv_instance_without_vertices_raises(tmp_path):
+    rows = [(1, *v, 0) for v in SQUARE] + [(2, *p, 1) for p in POINTS]
+    with pytest.raises(ValueError, match="no polygon vertices"):
+        list(load_instances(write_csv(tmp_path / "instances.csv", rows)))
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".vertices.npy"])
+def test_binary_round_trip(tmp_path, suffix):
+    path = str(tmp_path / f"instances{suffix}")
+    save_instances(path, [SQUARE, TRIANGLE], test_points=[POINTS, None], ids=[10, 20])
+    loaded = list(load_instances(path))
+    assert [i for i, _, _ in loaded] == [10, 20]
+    np.testing.assert_array_equal(loaded[0][1], SQUARE)
+    np.testing.assert_array_equal(loaded[0][2], POINTS)
+    np.testing.assert_array_equal(loaded[1][1], TRIANGLE)
+    assert loaded[1][2] is None
+    # Every polygon is a view into one flat array
+    assert loaded[0][1].base is not None and loaded[0][1].base is loaded[1][1].base
+
+
+def test_npy_family_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "instances.vertices.npy")
+    save_instances(path, [SQUARE, TRIANGLE])
+    (_, square, _), (_, triangle, _) = load_instances(path)
+    assert isinstance(square, np.memmap) and isinstance(triangle, np.memmap)
+    assert square.base is not None
+    (_, square, _), _ = load_instances(path, mmap=False)
+    assert not isinstance(square, np.memmap)
+
+
+def test_binary_instance_without_vertices_raises(tmp_path):
+    path = str(tmp_path / "instances.npz")
+    save_instances(path, [SQUARE, np.empty((0, 2))], test_points=[None, POINTS])
+    with pytest.raises(ValueError, match="no polygon vertices"):
+        list(load_instances(path))
+
+
+def test_unsupported_file(tmp_path):
+    with pytest.raises(ValueError):
+        list(load_instances(str(tmp_path / "instances.txt")))
+    with pytest.raises(ValueError):
+        save_instances(str(tmp_path / "instances.csv"), [SQUARE])
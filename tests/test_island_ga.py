@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from io_operations import generate_regular_polygon
+from optimization import island_genetic_algorithm
+
+POLYGON = generate_regular_polygon(8, 2.0)
+
+
+def run(processes):
+    result = island_genetic_algorithm(POLYGON, 4, n_islands=4, island_size=20, generations=30,
+                                      migration_interval=10, migration_topology="random",
+                                      processes=processes, seed=5)
+    return result, np.random.randint(1 << 30)
+
+
+def test_result_does_not_depend_on_process_count():
+    (points, fitness, history), after = run(1)
+    for processes in (2, 4):
+        (other_points, other_fitness, other_history), other_after = run(processes)
+        np.testing.assert_array_equal(other_points, points)
+        assert other_fitness == fitness
+        np.testing.assert_array_equal(np.asarray(other_history), np.asarray(history))
+        # The caller's generator continues the same way either way
+        assert other_after == after
+
+
+@pytest.mark.parametrize("topology", ["ring", "random", "fully_connected"])
+def test_best_point_is_inside(topology):
+    from pso_optimizer import fast_is_inside
+    points, fitness, _ = island_genetic_algorithm(POLYGON, 3, n_islands=3, island_size=10, generations=10,
+                                                  migration_interval=5, migration_topology=topology,
+                                                  processes=1, seed=0)
+    assert np.all(fast_is_inside(points, POLYGON))
+    assert fitness > 0
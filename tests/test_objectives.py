@@ -0,0 +1,55 @@
+import itertools
+import numpy as np
+import pytest
+from objectives import OBJECTIVES, get_objective, score
+
+
+# --- Brute-force reference scores, straight from the definitions ---
+def brute_force(name, points, weights):
+    pairs = list(itertools.combinations(range(len(points)), 2))
+    distance = lambda i, j: np.linalg.norm(points[i] - points[j])
+    if name == "sum_sq":
+        return sum(distance(i, j) ** 2 for i, j in pairs)
+    if name == "sum":
+        return sum(distance(i, j) for i, j in pairs)
+    if name == "max_min":
+        return min(distance(i, j) for i, j in pairs)
+    if name == "weighted":
+        return sum(weights[i] * weights[j] * distance(i, j) ** 2 for i, j in pairs)
+    raise KeyError(name)
+
+
+@pytest.fixture
+def placements():
+    rng = np.random.default_rng(0)
+    # Offset far from the origin, where the cancellation-prone formulas go wrong
+    return rng.uniform(-1, 1, size=(8, 5, 2)) + 1e3, rng.uniform(0.5, 2.0, size=5)
+
+
+@pytest.mark.parametrize("name", sorted(OBJECTIVES))
+def test_batch_matches_brute_force(name, placements):
+    population, weights = placements
+    batch = get_objective(name).batch(population, weights)
+    assert batch.shape == (len(population),)
+    for points, value in zip(population, batch):
+        assert value == pytest.approx(brute_force(name, points, weights), rel=1e-9)
+        assert score(points, name, weights) == pytest.approx(value)
+
+
+@pytest.mark.parametrize("name", [n for n in sorted(OBJECTIVES) if OBJECTIVES[n].delta is not None])
+def test_delta_matches_rescoring(name, placements):
+    population, weights = placements
+    delta = get_objective(name).delta
+    rng = np.random.default_rng(1)
+    for points in population:
+        for index in range(len(points)):
+            new_point = points[index] + rng.normal(scale=0.3, size=2)
+            moved = points.copy()
+            moved[index] = new_point
+            expected = brute_force(name, moved, weights) - brute_force(name, points, weights)
+            assert delta(points, index, new_point, weights) == pytest.approx(expected, rel=1e-6, abs=1e-9)
+
+
+def test_unknown_objective():
+    with pytest.raises(ValueError):
+        get_objective("nope")
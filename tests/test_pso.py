@@ -0,0 +1,37 @@
+import random
+import numpy as np
+import pytest
+from io_operations import generate_regular_polygon
+from pso_optimizer import particle_swarm_optimization
+
+HEXAGON = generate_regular_polygon(6, 1.0)
+
+
+def run(polygon, **kwargs):
+    np.random.seed(0)
+    random.seed(0)
+    return particle_swarm_optimization(polygon, 4, 15, 30, verbose=False, **kwargs)
+
+
+@pytest.mark.parametrize("boundary", ["resample", "absorb", "reflect", "project"])
+def test_swarm_is_scale_invariant(boundary):
+    # Velocities start (and are clamped) in units of the region's extent, so scaling the
+    # polygon scales the whole run; only the absolute boundary tolerances differ
+    _, fitness, _ = run(HEXAGON, boundary=boundary)
+    for scale in (1e-3, 1e3):
+        _, scaled_fitness, _ = run(HEXAGON * scale, boundary=boundary)
+        assert scaled_fitness / scale ** 2 == pytest.approx(fitness, rel=1e-3)
+
+
+def test_first_move_scales_with_the_region():
+    # Without inertia decay or attraction, the first update moves each particle by its
+    # initial velocity alone
+    scores = []
+    for scale in (1e-3, 1.0, 1e3):
+        np.random.seed(0)
+        random.seed(0)
+        _, fitness, _ = particle_swarm_optimization(HEXAGON * scale, 4, 15, 1, w=1.0, c1=0.0, c2=0.0,
+                                                    boundary="absorb", verbose=False)
+        scores.append(fitness / scale ** 2)
+    assert scores[0] == pytest.approx(scores[1], rel=1e-6)
+    assert scores[2] == pytest.approx(scores[1], rel=1e-6)
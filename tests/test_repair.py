@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from polytope import Polytope, as_region, is_region_object
+from repair import REPAIR_STRATEGIES, inside_halfplanes, polygon_halfplanes, repair
+
+SQUARE = np.array([[0.0, 0.0], [2.0, 0.0], [2.0, 2.0], [0.0, 2.0]])
+L_SHAPE = np.array([[0.0, 0.0], [2.0, 0.0], [2.0, 1.0], [1.0, 1.0], [1.0, 2.0], [0.0, 2.0]])
+REGIONS = {
+    "square": SQUARE,
+    "l_shape": L_SHAPE,  # raw non-convex array: must not be repaired against its hull
+    "cube": Polytope.box([0.0, 0.0, 0.0], [2.0, 2.0, 2.0]),
+}
+
+
+def inside(points, polygon):
+    region = as_region(polygon)
+    flat = points.reshape(-1, points.shape[-1])
+    if is_region_object(region):
+        return region.contains(flat)
+    normals, offsets, _ = polygon_halfplanes(region)
+    return inside_halfplanes(flat, normals, offsets)
+
+
+@pytest.mark.parametrize("strategy", REPAIR_STRATEGIES)
+@pytest.mark.parametrize("name", sorted(REGIONS))
+def test_repair_keeps_points_inside(name, strategy):
+    np.random.seed(0)
+    polygon = REGIONS[name]
+    dim = 3 if name == "cube" else 2
+    rng = np.random.default_rng(0)
+    # A (P, k, d) population that moved from inside positions, some of them far outside
+    previous = rng.uniform(0.2, 0.8, size=(6, 4, dim))
+    points = previous + rng.normal(scale=1.5, size=previous.shape)
+    repaired = repair(points, polygon, strategy, previous=previous)
+    assert repaired.shape == points.shape
+    assert np.all(inside(repaired, polygon))
+    # Points that were already inside are left alone
+    was_inside = inside(points, polygon).reshape(points.shape[:-1])
+    np.testing.assert_array_equal(repaired[was_inside], points[was_inside])
+
+
+@pytest.mark.parametrize("strategy", ["clamp", "project"])
+def test_repair_without_previous(strategy):
+    points = np.array([[3.0, 3.0], [-1.0, 0.5], [0.5, 0.5]])
+    assert np.all(inside(repair(points, L_SHAPE, strategy), L_SHAPE))
+
+
+def test_repair_needs_previous():
+    with pytest.raises(ValueError):
+        repair(np.array([[3.0, 3.0]]), SQUARE, "reflect")
+    with pytest.raises(ValueError):
+        repair(np.array([[3.0, 3.0]]), SQUARE, "teleport")
@@ -0,0 +1,98 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from solver_service import SolverService, make_server, solve_remote
+
+HEXAGON = [[np.cos(a), np.sin(a)] for a in np.linspace(0, 2 * np.pi, 6, endpoint=False)]
+
+
+@pytest.fixture(scope="module")
+def server():
+    # A wide batch window so that concurrent requests reliably share a batch
+    service = SolverService(workers=2, batch_window=0.2)
+    httpd = make_server(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield service, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+
+def post(url, payload):
+    try:
+        return 200, solve_remote(payload, url)
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_batched_request_matches_solo(server):
+    service, url = server
+    before = dict(service.stats())
+    payloads = [{"polygon": HEXAGON, "k": 3, "iterations": 300, "seed": seed} for seed in range(6)]
+    with ThreadPoolExecutor(len(payloads)) as pool:
+        batched = list(pool.map(lambda p: post(url, p), payloads))
+    assert all(status == 200 for status, _ in batched)
+    stats = service.stats()
+    assert stats["batched_requests"] - before["batched_requests"] == len(payloads)
+    assert stats["batches"] - before["batches"] < len(payloads)
+
+    status, alone = post(url, payloads[2])
+    assert status == 200
+    assert alone["points"] == batched[2][1]["points"]
+    assert alone["fitness"] == batched[2][1]["fitness"]
+
+
+@pytest.mark.parametrize("optimizer", ["GA", "PSO", "ACO", "SA"])
+def test_every_optimizer_with_defaults(server, optimizer):
+    _, url = server
+    status, body = post(url, {"polygon": HEXAGON, "k": 3, "optimizer": optimizer, "iterations": 10, "seed": 1})
+    assert status == 200, body
+    assert np.shape(body["points"]) == (3, 2)
+    assert body["fitness"] > 0
+
+
+def test_params_override_defaults(server):
+    _, url = server
+    status, body = post(url, {"polygon": HEXAGON, "k": 3, "optimizer": "PSO", "iterations": 10,
+                              "params": {"num_particles": 5, "topology": "ring"}})
+    assert status == 200, body
+
+
+@pytest.mark.parametrize("payload", [
+    {"polygon": HEXAGON, "k": 3, "optimizer": "PSO", "params": {"verbose": False}},
+    {"polygon": HEXAGON, "k": 3, "optimizer": "GA", "params": {"generations": 5}},
+    {"polygon": HEXAGON, "k": 0},
+    {"polygon": HEXAGON, "k": 3, "optimizer": "XYZ"},
+    {"polygon": [[0, 0], [1, 1], [2, 2]], "k": 3},  # collinear: no hull
+])
+def test_bad_requests_are_400(server, payload):
+    service, url = server
+    before = service.stats()
+    status, body = post(url, payload)
+    assert status == 400 and body["error"]
+    stats = service.stats()
+    assert stats["requests"] == before["requests"] + 1
+    assert stats["errors"] == before["errors"] + 1
+
+
+def test_stats(server):
+    service, url = server
+    with urllib.request.urlopen(f"{url}/stats") as response:
+        stats = json.loads(response.read())
+    assert stats["workers"] == 2
+    assert stats["completed"] + stats["errors"] <= stats["requests"]
+    assert stats["cached_regions"] >= 1
+
+
+def test_close_resolves_queued_work():
+    service = SolverService(workers=1, batch_window=0.05)
+    futures = [service.submit({"polygon": HEXAGON, "k": 3, "iterations": 50, "seed": s}) for s in range(3)]
+    service.close()
+    assert all(np.shape(f.result(timeout=30)[0]) == (3, 2) for f in futures)
+    with pytest.raises(RuntimeError):
+        service.submit({"polygon": HEXAGON, "k": 3, "iterations": 50})
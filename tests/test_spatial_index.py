@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from matplotlib.path import Path
+from polytope import as_region
+from spatial_index import GridIndex
+
+
+def star(n, seed):
+    rng = np.random.default_rng(seed)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radii = rng.uniform(0.3, 1.0, n)
+    return np.column_stack((radii * np.cos(angles), radii * np.sin(angles))) * 5.0 + 10.0
+
+def comb(teeth):
+    # Thin teeth pointing up from a base: many boundary cells, deep concavities
+    ring = [[0.0, 0.0], [2.0 * teeth - 1, 0.0]]
+    for i in range(teeth - 1, -1, -1):
+        ring += [[2.0 * i + 1, 4.0], [2.0 * i, 4.0]]
+        if i > 0:
+            ring += [[2.0 * i, 1.0], [2.0 * i - 1, 1.0]]
+    return np.array(ring)
+
+POLYGONS = {
+    "l_shape": np.array([[0.0, 0.0], [2.0, 0.0], [2.0, 1.0], [1.0, 1.0], [1.0, 2.0], [0.0, 2.0]]),
+    "star_12": star(12, 0),
+    "star_400": star(400, 1),
+    "comb": comb(8),
+    "clockwise_star": star(40, 2)[::-1],
+}
+
+
+@pytest.mark.parametrize("name", sorted(POLYGONS))
+def test_contains_matches_path(name):
+    polygon = POLYGONS[name]
+    index = GridIndex(polygon)
+    rng = np.random.default_rng(3)
+    lower, upper = polygon.min(axis=0), polygon.max(axis=0)
+    margin = 0.1 * (upper - lower)
+    points = rng.uniform(lower - margin, upper + margin, size=(20000, 2))
+    np.testing.assert_array_equal(index.contains(points), Path(polygon).contains_points(points))
+    # Batches of any leading shape
+    assert index.contains(points.reshape(100, 200, 2)).shape == (100, 200)
+
+
+@pytest.mark.parametrize("name", sorted(POLYGONS))
+def test_sample_is_inside(name):
+    np.random.seed(0)
+    polygon = POLYGONS[name]
+    samples = GridIndex(polygon).sample(2000)
+    assert samples.shape == (2000, 2)
+    assert np.all(Path(polygon).contains_points(samples))
+
+
+def test_as_region_indexes_nonconvex_polygons():
+    assert isinstance(as_region(POLYGONS["l_shape"]), GridIndex)
+    assert not as_region(POLYGONS["l_shape"]).convex
+    square = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+    assert not isinstance(as_region(square), GridIndex)
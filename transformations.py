@@ -1,33 +1,58 @@
 import numpy as np
+from polytope import Polytope, is_polytope
+from spatial_index import GridIndex
+
+# All transformations work on vertex arrays of any dimension d; rotation and shear act in
+# the plane spanned by `axes`. A Polytope or GridIndex is transformed through its vertices.
+
+def _transform(polygon, fn):
+    if is_polytope(polygon):
+        return Polytope.from_vertices(fn(polygon.vertices))
+    if isinstance(polygon, GridIndex):
+        return GridIndex(fn(polygon.vertices))
+    return fn(np.asarray(polygon, dtype=float))
+
+def _plane_matrix(dim, axes, block):
+    matrix = np.eye(dim)
+    i, j = axes
+    matrix[np.ix_([i, j], [i, j])] = block
+    return matrix
 
 def scale_polygon(polygon, scale_factor):
-    centroid = np.mean(polygon, axis=0)
-    scaled_polygon = centroid + scale_factor * (polygon - centroid)
-    return np.round(scaled_polygon, decimals=6)
+    def scale(vertices):
+        centroid = np.mean(vertices, axis=0)
+        scaled_polygon = centroid + scale_factor * (vertices - centroid)
+        return np.round(scaled_polygon, decimals=6)
+    return _transform(polygon, scale)
 
-def rotate_polygon(polygon, angle):
+def rotate_polygon(polygon, angle, axes=(0, 1)):
     angle_rad = np.radians(angle)
-    rotation_matrix = np.array([
-        [np.cos(angle_rad), -np.sin(angle_rad)],
-        [np.sin(angle_rad), np.cos(angle_rad)]
-    ])
-    
-    centroid = np.mean(polygon, axis=0)
-    rotated_polygon = np.dot(polygon - centroid, rotation_matrix.T) + centroid
-    
-    return np.round(rotated_polygon, decimals=6)
-
-def translate_polygon(polygon, tx, ty):
-    translated_polygon = polygon + np.array([tx, ty])
-    return np.round(translated_polygon, decimals=6)
-
-def shear_polygon(polygon, shear_x, shear_y):
-    shear_matrix = np.array([
-        [1, shear_x],
-        [shear_y, 1]
-    ])
-    
-    centroid = np.mean(polygon, axis=0)
-    sheared_polygon = np.dot(polygon - centroid, shear_matrix.T) + centroid
-    
-    return np.round(sheared_polygon, decimals=6)
+
+    def rotate(vertices):
+        rotation_matrix = _plane_matrix(vertices.shape[1], axes, [
+            [np.cos(angle_rad), -np.sin(angle_rad)],
+            [np.sin(angle_rad), np.cos(angle_rad)]
+        ])
+        centroid = np.mean(vertices, axis=0)
+        rotated_polygon = np.dot(vertices - centroid, rotation_matrix.T) + centroid
+        return np.round(rotated_polygon, decimals=6)
+    return _transform(polygon, rotate)
+
+def translate_polygon(polygon, tx, ty, *offsets):
+    """Translate by (tx, ty, ...); missing trailing offsets are zero."""
+    def translate(vertices):
+        shift = np.zeros(vertices.shape[1])
+        shift[:2 + len(offsets)] = (tx, ty) + offsets
+        return np.round(vertices + shift, decimals=6)
+    return _transform(polygon, translate)
+
+def shear_polygon(polygon, shear_x, shear_y, axes=(0, 1)):
+    def shear(vertices):
+        shear_matrix = _plane_matrix(vertices.shape[1], axes, [
+            [1, shear_x],
+            [shear_y, 1]
+        ])
+        centroid = np.mean(vertices, axis=0)
+        sheared_polygon = np.dot(vertices - centroid, shear_matrix.T) + centroid
+        return np.round(sheared_polygon, decimals=6)
+    return _transform(polygon, shear)
@@ -0,0 +1,190 @@
+import json
+import math
+import random
+from multiprocessing import Pool
+import numpy as np
+from polytope import is_region_object
+from portfolio import run_slice
+
+# --- Hyperparameter tuning with successive halving / Hyperband ---
+# Configurations are sampled from a per-optimizer search space, scored on a set of training
+# polygons at a small iteration budget, and only the best 1/eta survive to the next,
+# eta-times larger budget. Winners are always scored at the full budget, so scores from
+# different brackets compare like with like.
+
+# name -> (kind, low, high) for "float"/"int"/"log"/"logint", or ("choice", options)
+SEARCH_SPACES = {
+    "PSO": {
+        "num_particles": ("logint", 10, 200),
+        "w": ("float", 0.3, 0.9),
+        "c1": ("float", 0.5, 2.5),
+        "c2": ("float", 0.5, 2.5),
+        "topology": ("choice", ["global", "ring", "von_neumann", "random"]),
+        "v_max_fraction": ("float", 0.05, 0.5),
+        "boundary": ("choice", ["resample", "absorb", "reflect", "project"]),
+    },
+    "GA": {
+        "pop_size": ("logint", 20, 200),
+        "crossover_rate": ("float", 0.5, 1.0),
+        "mutation_rate": ("log", 0.001, 0.3),
+    },
+    "ACO": {
+        "n_ants": ("logint", 5, 100),
+        "alpha": ("float", 0.5, 3.0),
+        "beta": ("float", 0.5, 3.0),
+        "evaporation_rate": ("float", 0.1, 0.9),
+        "q": ("log", 1.0, 1000.0),
+        "candidate_strategy": ("choice", ["uniform", "boundary", "mixed"]),
+    },
+    "SA": {
+        "cooling_rate": ("float", 0.9, 0.9999),
+        "schedule": ("choice", ["geometric", "logarithmic", "lundy_mees", "adaptive"]),
+        "adapt_gain": ("float", 0.1, 2.0),
+        "reheat_after": ("logint", 50, 2000),
+    },
+}
+
+# Scale-dependent settings are pinned to their self-calibrating values so that a config
+# tuned on one polygon transfers to the same shape at any size
+FIXED_PARAMS = {"SA": {"initial_temp": "auto", "step_size": None}}
+
+# Parameter that carries the iteration budget, and (min, max) budget for Hyperband
+BUDGET_PARAM = {"PSO": "iterations", "GA": "generations", "ACO": "n_iterations", "SA": "iterations"}
+DEFAULT_BUDGETS = {"PSO": (10, 270), "GA": (10, 270), "ACO": (5, 135), "SA": (200, 5400)}
+
+
+def sample_config(space, rng):
+    config = {}
+    for name, spec in space.items():
+        kind = spec[0]
+        if kind == "choice":
+            config[name] = spec[1][rng.randrange(len(spec[1]))]
+        elif kind == "float":
+            config[name] = rng.uniform(spec[1], spec[2])
+        elif kind == "int":
+            config[name] = rng.randint(spec[1], spec[2])
+        elif kind == "log":
+            config[name] = math.exp(rng.uniform(math.log(spec[1]), math.log(spec[2])))
+        elif kind == "logint":
+            config[name] = int(round(math.exp(rng.uniform(math.log(spec[1]), math.log(spec[2])))))
+        else:
+            raise ValueError(f"Unknown parameter kind '{kind}' for {name}")
+    return config
+
+
+def fitness_scale(polygon, k):
+    # sum_{i<j} |x_i - x_j|^2 = k * sum_i |x_i - c|^2 <= k^2 * max_v |v - a|^2 for any point a,
+    # so this normalises scores to (0, 1] whatever the polygon's size
+    vertices = polygon.vertices if is_region_object(polygon) else polygon
+    centre = np.mean(vertices, axis=0)
+    return k ** 2 * np.max(np.sum((vertices - centre) ** 2, axis=1))
+
+
+def _evaluate_task(task):
+    optimizer, config, budget, polygon, k, seed = task
+    np.random.seed(seed)
+    random.seed(seed)
+    params = dict(FIXED_PARAMS.get(optimizer, {}), **config)
+    params[BUDGET_PARAM[optimizer]] = int(budget)
+    _, fitness = run_slice(optimizer, polygon, k, params, callback=None)
+    return fitness / fitness_scale(polygon, k)
+
+
+def _score_configs(optimizer, configs, budget, polygons, k, seeds, mapper, rng):
+    tasks = [(optimizer, config, budget, polygon, k, rng.randrange(2 ** 31 - 1))
+             for config in configs for polygon in polygons for _ in range(seeds)]
+    scores = np.array(list(mapper(_evaluate_task, tasks))).reshape(len(configs), -1)
+    return scores.mean(axis=1)
+
+
+def successive_halving(optimizer, polygons, k, n_configs, min_budget, max_budget, eta=3,
+                       seeds=1, mapper=map, rng=None, configs=None):
+    """Return (best_config, best_score, trace) for one successive-halving bracket.
+
+    best_score is measured at max_budget, also when the bracket ran out of configs earlier.
+    """
+    rng = rng or random.Random()
+    if configs is None:
+        configs = [sample_config(SEARCH_SPACES[optimizer], rng) for _ in range(n_configs)]
+    budget = min_budget
+    trace = []
+    while True:
+        scores = _score_configs(optimizer, configs, budget, polygons, k, seeds, mapper, rng)
+        trace.append({"budget": int(budget), "configs": len(configs), "best_score": float(np.max(scores))})
+        if len(configs) == 1 or budget >= max_budget:
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+            if budget < max_budget:
+                score = float(_score_configs(optimizer, [configs[best]], max_budget, polygons, k, seeds,
+                                             mapper, rng)[0])
+                trace.append({"budget": int(max_budget), "configs": 1, "best_score": score})
+            return configs[best], score, trace
+        keep = max(1, len(configs) // eta)
+        survivors = np.argsort(scores)[::-1][:keep]
+        configs = [configs[i] for i in survivors]
+        budget = min(budget * eta, max_budget)
+
+
+def hyperband(optimizer, polygons, k, min_budget, max_budget, eta=3, seeds=1, mapper=map, rng=None):
+    """Run every Hyperband bracket and return the best (config, score, trace).
+
+    Each bracket's winner is re-scored at max_budget on fresh seeds before the brackets are
+    compared, so a winner that only looked best through a lucky draw is not favoured.
+    """
+    rng = rng or random.Random()
+    s_max = int(math.floor(math.log(max_budget / min_budget, eta) + 1e-9))
+    best = (None, -np.inf, [])
+    for s in range(s_max, -1, -1):
+        n_configs = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        bracket_min = max_budget / eta ** s
+        config, _, trace = successive_halving(optimizer, polygons, k, n_configs, bracket_min, max_budget,
+                                              eta=eta, seeds=seeds, mapper=mapper, rng=rng)
+        score = float(_score_configs(optimizer, [config], max_budget, polygons, k, seeds, mapper, rng)[0])
+        trace.append({"budget": int(max_budget), "configs": 1, "best_score": score})
+        if score > best[1]:
+            best = (config, score, trace)
+    return best
+
+
+def tune(training_set, k_values, optimizers=("GA", "PSO", "ACO", "SA"), method="hyperband",
+         n_configs=27, budgets=None, eta=3, seeds=1, processes=None, seed=None):
+    """Tune each optimizer for every (shape class, k).
+
+    training_set maps a shape-class name to a list of training polygons. Returns
+    {(shape_class, k, optimizer): {"config": ..., "score": ..., "trace": ...}} where the
+    score is the mean fitness normalised by fitness_scale().
+    """
+    rng = random.Random(seed)
+    budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+    pool = Pool(processes) if processes != 1 else None
+    mapper = pool.imap if pool is not None else map
+
+    results = {}
+    try:
+        for shape_class, polygons in training_set.items():
+            for k in k_values:
+                for optimizer in optimizers:
+                    min_budget, max_budget = budgets[optimizer]
+                    if method == "hyperband":
+                        config, score, trace = hyperband(optimizer, polygons, k, min_budget, max_budget,
+                                                         eta=eta, seeds=seeds, mapper=mapper, rng=rng)
+                    elif method == "successive_halving":
+                        config, score, trace = successive_halving(optimizer, polygons, k, n_configs,
+                                                                  min_budget, max_budget, eta=eta,
+                                                                  seeds=seeds, mapper=mapper, rng=rng)
+                    else:
+                        raise ValueError(f"Unknown tuning method '{method}'")
+                    print(f"[{shape_class}, k={k}] {optimizer}: score {score:.4f} with {config}")
+                    results[(shape_class, k, optimizer)] = {"config": config, "score": score, "trace": trace}
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return results
+
+
+def save_tuning_results(results, filename):
+    rows = [{"shape_class": shape_class, "k": k, "optimizer": optimizer, **entry}
+            for (shape_class, k, optimizer), entry in results.items()]
+    with open(filename, 'w') as file:
+        json.dump(rows, file, indent=2)
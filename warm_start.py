@@ -0,0 +1,33 @@
+import numpy as np
+from objectives import get_objective
+
+# --- Warm starts ---
+# Every optimizer accepts `initial_points`: one (k, d) placement or an (m, k, d) population
+# of them. Seeds take the first slots of the starting population and the rest is sampled as
+# usual. A k-point solution seeds k + 1 by adding the boundary point that scores best, and a
+# solution from a short budget seeds a longer one as it is.
+
+def as_population(initial_points, k, dim):
+    """Seeds as an (m, k, d) array."""
+    seeds = np.asarray(initial_points, dtype=float)
+    if seeds.shape[-2:] != (k, dim):
+        raise ValueError(f"Initial points must have shape (k, d) or (m, k, d) with k={k}, d={dim}; "
+                         f"got {seeds.shape}")
+    return seeds.reshape(-1, k, dim)
+
+def extend_placement(points, polygon, objective="sum_sq", weights=None, n_candidates=256):
+    """Add one point to a placement at the boundary location that scores best.
+
+    Candidates are the region's vertices plus boundary samples; `weights`, if used, are
+    those of the extended placement.
+    """
+    from aco_optimizer import generate_candidates
+    from polytope import as_region
+
+    polygon = as_region(polygon)
+    points = np.asarray(points, dtype=float)
+    candidates = generate_candidates(polygon, n_candidates, "boundary")
+    extended = np.concatenate((np.broadcast_to(points, (len(candidates),) + points.shape),
+                               candidates[:, None, :]), axis=1)
+    scores = get_objective(objective).batch(extended, weights)
+    return extended[np.argmax(scores)]